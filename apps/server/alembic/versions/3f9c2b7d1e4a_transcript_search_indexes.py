@@ -0,0 +1,74 @@
+"""transcript search indexes
+
+Revision ID: 3f9c2b7d1e4a
+Revises: a806a5373448
+Create Date: 2026-10-15 21:40:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9c2b7d1e4a"
+down_revision: Union[str, Sequence[str], None] = "a806a5373448"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Replace the btree over an unused string column with a generated tsvector
+    op.drop_index(op.f("ix_transcripts_search_vector"), table_name="transcripts")
+    op.drop_column("transcripts", "search_vector")
+    op.add_column(
+        "transcripts",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('english', text)", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_transcripts_search_vector",
+        "transcripts",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+    # (video_id, start_time) supersedes the single-column video_id index
+    op.create_index(
+        "ix_transcripts_video_id_start_time",
+        "transcripts",
+        ["video_id", "start_time"],
+        unique=False,
+    )
+    op.drop_index(op.f("ix_transcripts_video_id"), table_name="transcripts")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        op.f("ix_transcripts_video_id"), "transcripts", ["video_id"], unique=False
+    )
+    op.drop_index("ix_transcripts_video_id_start_time", table_name="transcripts")
+
+    op.drop_index("ix_transcripts_search_vector", table_name="transcripts")
+    op.drop_column("transcripts", "search_vector")
+    op.add_column(
+        "transcripts",
+        sa.Column("search_vector", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    )
+    op.create_index(
+        op.f("ix_transcripts_search_vector"),
+        "transcripts",
+        ["search_vector"],
+        unique=False,
+    )
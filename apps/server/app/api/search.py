@@ -1,22 +1,42 @@
 """Search routes."""
 
+import asyncio
+import heapq
+from operator import itemgetter
 from uuid import UUID
 
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import bindparam
 from sqlmodel import select
 
 from app.core.dependencies import (
     SessionDep,
     EmbeddingDep,
     VectorStoreDep,
+    SearchCacheDep,
 )
 from app.core.logging import get_logger
 from app.models import Video, Transcript
 from app.schemas import SearchQuery, SearchResult, SearchResponse, SearchType
-from app.utils import rescale_siglip_score
+from app.utils import rescale_siglip_scores
 
 logger = get_logger(__name__)
-router = APIRouter()
+# orjson serializes large result/segment lists much faster than stdlib json
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Hits of one video within the same window (seconds) count as one moment
+DEDUPE_WINDOW = 5.0
+
+# Statements are built once at import; only bound parameters vary per request
+_VIDEO_FILENAMES = select(Video.id, Video.filename).where(
+    Video.id.in_(bindparam("video_ids", expanding=True))
+)
+_VIDEO_TRANSCRIPT = (
+    select(Transcript.text, Transcript.start_time, Transcript.end_time)
+    .where(Transcript.video_id == bindparam("video_id"))
+    .order_by(Transcript.start_time)
+)
 
 
 @router.post("", response_model=SearchResponse)
@@ -25,6 +45,7 @@ async def search_videos(
     session: SessionDep,
     embedding: EmbeddingDep,
     vector_store: VectorStoreDep,
+    search_cache: SearchCacheDep,
 ) -> SearchResponse:
     """
     Search videos by natural language query.
@@ -39,49 +60,79 @@ async def search_videos(
         limit=query.limit,
     )
 
-    results = []
-
-    # Visual search
-    if query.search_type in (SearchType.VISUAL, SearchType.HYBRID):
-        visual_embedding = embedding.embed_text_visual(query.query)
-        visual_results = vector_store.search_visual(
+    async def _visual() -> list[dict]:
+        visual_embedding = await embedding.embed_text_visual_async(query.query)
+        return await asyncio.to_thread(
+            vector_store.search_visual,
             query_embedding=visual_embedding,
             limit=query.limit,
             score_threshold=query.threshold,
+            hnsw_ef=query.ef_search,
         )
-        results.extend(visual_results)
 
-    # Speech search
-    if query.search_type in (SearchType.SPEECH, SearchType.HYBRID):
-        speech_embedding = embedding.embed_text(query.query)
-        speech_results = vector_store.search_speech(
+    async def _speech() -> list[dict]:
+        speech_embedding = await embedding.embed_text_async(query.query)
+        return await asyncio.to_thread(
+            vector_store.search_speech,
             query_embedding=speech_embedding,
             limit=query.limit,
             score_threshold=query.threshold,
+            hnsw_ef=query.ef_search,
         )
-        results.extend(speech_results)
 
-    # Sort by score and deduplicate
-    results.sort(key=lambda x: x["score"], reverse=True)
-
-    # Limit results
-    results = results[: query.limit]
+    cache_key = search_cache.make_key(
+        query.search_type.value,
+        query.query,
+        query.limit,
+        query.threshold,
+        query.ef_search,
+    )
+    results = await search_cache.get(cache_key)
+
+    if results is None:
+        # Run visual and speech search concurrently off the event loop
+        branches = []
+        if query.search_type in (SearchType.VISUAL, SearchType.HYBRID):
+            branches.append(_visual())
+        if query.search_type in (SearchType.SPEECH, SearchType.HYBRID):
+            branches.append(_speech())
+
+        # Deduplicate hits for the same moment (a frame and the speech over
+        # it, or near-identical frames of one scene), keeping the best score
+        best: dict[tuple, dict] = {}
+        for branch_results in await asyncio.gather(*branches):
+            for r in branch_results:
+                key = (r["video_id"], r["timestamp"] // DEDUPE_WINDOW)
+                if key not in best or best[key]["score"] < r["score"]:
+                    best[key] = r
+
+        # Top-k by score without sorting the full merged list
+        results = heapq.nlargest(query.limit, best.values(), key=itemgetter("score"))
+
+        await search_cache.set(cache_key, results)
+
+    # Filenames are stored in the payload at ingest; only points indexed
+    # before that need a database lookup
+    missing_ids = {UUID(r["video_id"]) for r in results if not r.get("video_filename")}
+    filenames: dict[str, str] = {}
+    if missing_ids:
+        video_query = await session.execute(
+            _VIDEO_FILENAMES, {"video_ids": missing_ids}
+        )
+        filenames = {
+            str(video_id): filename for video_id, filename in video_query.all()
+        }
 
-    # Enrich with video metadata
-    video_ids = {UUID(r["video_id"]) for r in results}
-    video_query = await session.execute(select(Video).where(Video.id.in_(video_ids)))
-    videos = {str(v.id): v for v in video_query.scalars().all()}
+    display_scores = rescale_siglip_scores([r["score"] for r in results]).tolist()
 
     search_results = []
-    for r in results:
-        video = videos.get(r["video_id"])
-        if video:
-            display_score = rescale_siglip_score(r["score"])
-
+    for r, display_score in zip(results, display_scores):
+        filename = r.get("video_filename") or filenames.get(r["video_id"])
+        if filename:
             search_results.append(
                 SearchResult(
                     video_id=UUID(r["video_id"]),
-                    video_filename=video.filename,
+                    video_filename=filename,
                     timestamp=r["timestamp"],
                     end_timestamp=r.get("end_timestamp"),
                     score=display_score,
@@ -108,21 +159,17 @@ async def get_video_transcript(
 ) -> dict:
     """Get full transcript for a video."""
 
-    result = await session.execute(
-        select(Transcript)
-        .where(Transcript.video_id == video_id)
-        .order_by(Transcript.start_time)
-    )
-    transcripts = result.scalars().all()
+    # Select plain columns: no ORM instances or identity-map bookkeeping
+    result = await session.execute(_VIDEO_TRANSCRIPT, {"video_id": video_id})
 
     return {
         "video_id": str(video_id),
         "segments": [
             {
-                "text": t.text,
-                "start_time": t.start_time,
-                "end_time": t.end_time,
+                "text": text,
+                "start_time": start_time,
+                "end_time": end_time,
             }
-            for t in transcripts
+            for text, start_time, end_time in result.all()
         ],
     }
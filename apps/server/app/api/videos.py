@@ -1,9 +1,11 @@
 """Video management routes."""
 
+import asyncio
 from pathlib import Path
 from uuid import UUID, uuid4
 from fastapi import APIRouter, HTTPException, BackgroundTasks, UploadFile, File
-from sqlmodel import select, delete
+from sqlalchemy import bindparam
+from sqlmodel import select, delete, func
 import shutil
 
 from app.core.dependencies import (
@@ -13,28 +15,65 @@ from app.core.dependencies import (
     TranscriptionDep,
     EmbeddingDep,
     VectorStoreDep,
+    SearchCacheDep,
+    VideoStatusDep,
+    JobQueueDep,
 )
-from app.services import (
-    VideoProcessorService,
-    AudioExtractorService,
-    TranscriptionService,
-    EmbeddingService,
-    VectorStoreService,
-)
+from app.services import VideoStatusService
 from app.core.config import get_settings
 from app.core.logging import get_logger
-from app.core.database import async_session_factory
 from app.models import Video, VideoStatus, Transcript
 from app.schemas import VideoRead, VideoListResponse, VideoUploadResponse
+from app.utils import pinned_utc_now
+from app.worker import process_video_task
 
 logger = get_logger(__name__)
 settings = get_settings()
 router = APIRouter()
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+
+# Statements are built once at import; only bound parameters vary per request
+# Only the columns VideoRead exposes; rows are trusted and skip validation
+_LIST_VIDEOS = (
+    select(*(getattr(Video, name) for name in VideoRead.model_fields))
+    .order_by(Video.created_at.desc())
+    .offset(bindparam("offset"))
+    .limit(bindparam("limit"))
+)
+_COUNT_VIDEOS = select(func.count()).select_from(Video)
+# Nothing is loaded in the session when deleting, so skip ORM synchronization
+_DELETE_TRANSCRIPTS = (
+    delete(Transcript)
+    .where(Transcript.video_id == bindparam("video_id"))
+    .execution_options(synchronize_session=False)
+)
+_DELETE_VIDEO = (
+    delete(Video)
+    .where(Video.id == bindparam("video_id"))
+    .returning(Video.original_path)
+    .execution_options(synchronize_session=False)
+)
+
+
+async def _with_live_status(
+    reads: list[VideoRead],
+    video_status: VideoStatusService,
+) -> list[VideoRead]:
+    """Overlay in-flight processing phases from Redis onto videos."""
+    live = await video_status.get_many(
+        [r.id for r in reads if r.status == VideoStatus.PENDING]
+    )
+    return [
+        read.model_copy(update={"status": live[read.id]}) if read.id in live else read
+        for read in reads
+    ]
+
 
 @router.get("", response_model=VideoListResponse)
 async def list_videos(
     session: SessionDep,
+    video_status: VideoStatusDep,
     page: int = 1,
     page_size: int = 20,
 ) -> VideoListResponse:
@@ -42,17 +81,15 @@ async def list_videos(
     offset = (page - 1) * page_size
 
     # Get videos
-    result = await session.execute(
-        select(Video).order_by(Video.created_at.desc()).offset(offset).limit(page_size)
-    )
-    videos = result.scalars().all()
+    result = await session.execute(_LIST_VIDEOS, {"offset": offset, "limit": page_size})
+    videos = [VideoRead.model_construct(**row._mapping) for row in result]
 
     # Get total count
-    count_result = await session.execute(select(Video))
-    total = len(count_result.scalars().all())
+    count_result = await session.execute(_COUNT_VIDEOS)
+    total = count_result.scalar_one()
 
     return VideoListResponse(
-        videos=[VideoRead.model_validate(v) for v in videos],
+        videos=await _with_live_status(videos, video_status),
         total=total,
         page=page,
         page_size=page_size,
@@ -63,15 +100,16 @@ async def list_videos(
 async def get_video(
     video_id: UUID,
     session: SessionDep,
+    video_status: VideoStatusDep,
 ) -> VideoRead:
     """Get a single video by ID."""
-    result = await session.execute(select(Video).where(Video.id == video_id))
-    video = result.scalar_one_or_none()
+    video = await session.get(Video, video_id)
 
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
 
-    return VideoRead.model_validate(video)
+    reads = await _with_live_status([VideoRead.model_validate(video)], video_status)
+    return reads[0]
 
 
 @router.post("/upload", response_model=VideoUploadResponse)
@@ -83,6 +121,9 @@ async def upload_video(
     transcription: TranscriptionDep,
     embedding: EmbeddingDep,
     vector_store: VectorStoreDep,
+    search_cache: SearchCacheDep,
+    video_status: VideoStatusDep,
+    job_queue: JobQueueDep,
     file: UploadFile = File(...),
 ) -> VideoUploadResponse:
     """Upload a video file directly."""
@@ -96,37 +137,41 @@ async def upload_video(
     unique_filename = f"{video_id}_{file.filename}"
     upload_path = settings.upload_dir / unique_filename
 
+    # Stream to disk in chunks so large uploads are never held in memory
     with open(upload_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
+        await asyncio.to_thread(shutil.copyfileobj, file.file, f, UPLOAD_CHUNK_SIZE)
 
     # Get video info
     try:
-        video_info = video_processor.get_video_info(str(upload_path))
+        video_info = await video_processor.get_video_info_async(str(upload_path))
     except RuntimeError as e:
         upload_path.unlink()  # Clean up
         raise HTTPException(status_code=400, detail=str(e))
 
     # Create video record first to get the ID
-    video = Video(
-        id=video_id,
-        filename=file.filename,
-        original_path=str(upload_path),
-        file_size=video_info.get("file_size"),
-        duration=video_info.get("duration"),
-        width=video_info.get("width"),
-        height=video_info.get("height"),
-        fps=video_info.get("fps"),
-        status=VideoStatus.PENDING,
-    )
+    # created_at and updated_at share one timestamp
+    with pinned_utc_now():
+        video = Video(
+            id=video_id,
+            filename=file.filename,
+            original_path=str(upload_path),
+            file_size=video_info.get("file_size"),
+            duration=video_info.get("duration"),
+            width=video_info.get("width"),
+            height=video_info.get("height"),
+            fps=video_info.get("fps"),
+            status=VideoStatus.PENDING,
+        )
 
     session.add(video)
     await session.commit()
     await session.refresh(video)
 
     # Generate thumbnail immediately (before background processing)
-    thumbnail_path = video_processor.extract_thumbnail(
-        str(upload_path), video.id, duration=video_info.get("duration")
+    thumbnail_path = await video_processor.extract_thumbnail(
+        str(upload_path),
+        video.id,
+        duration=video_info.get("duration"),
     )
     if thumbnail_path:
         video.thumbnail_path = thumbnail_path
@@ -134,17 +179,27 @@ async def upload_video(
 
     logger.info("video_uploaded", video_id=str(video.id), filename=video.filename)
 
-    # Add background task for processing
-    background_tasks.add_task(
-        process_video_task,
-        video_id=video.id,
-        video_path=str(upload_path),
-        video_processor=video_processor,
-        audio_extractor=audio_extractor,
-        transcription=transcription,
-        embedding=embedding,
-        vector_store=vector_store,
-    )
+    # Queue processing on the worker, or run in-process when Redis isn't set up
+    if job_queue is not None:
+        await job_queue.enqueue_job(
+            "process_video",
+            str(video.id),
+            str(upload_path),
+            _job_id=f"process_video:{video.id}",
+        )
+    else:
+        background_tasks.add_task(
+            process_video_task,
+            video_id=video.id,
+            video_path=str(upload_path),
+            video_processor=video_processor,
+            audio_extractor=audio_extractor,
+            transcription=transcription,
+            embedding=embedding,
+            vector_store=vector_store,
+            search_cache=search_cache,
+            video_status=video_status,
+        )
 
     return VideoUploadResponse(
         id=video.id,
@@ -159,28 +214,32 @@ async def delete_video(
     video_id: UUID,
     session: SessionDep,
     vector_store: VectorStoreDep,
+    search_cache: SearchCacheDep,
+    video_processor: VideoProcessorDep,
 ) -> dict:
     """Delete a video and its associated data."""
-    result = await session.execute(select(Video).where(Video.id == video_id))
-    video = result.scalar_one_or_none()
+    # Delete transcripts first (FK has no ON DELETE CASCADE)
+    await session.execute(_DELETE_TRANSCRIPTS, {"video_id": video_id})
 
-    if not video:
+    # Delete video record, returning its path instead of loading it first
+    result = await session.execute(_DELETE_VIDEO, {"video_id": video_id})
+    original_path = result.scalar_one_or_none()
+
+    if original_path is None:
         raise HTTPException(status_code=404, detail="Video not found")
 
+    await session.commit()
+
     # Delete embeddings from vector store
     vector_store.delete_video_embeddings(video_id)
-
-    # Delete transcripts first (use delete, not select!)
-    await session.execute(delete(Transcript).where(Transcript.video_id == video_id))
-
-    # Delete video record
-    await session.delete(video)
-    await session.commit()
+    await search_cache.invalidate()
 
     # Delete uploaded video file
-    if video.original_path:
-        video_file = Path(video.original_path)
+    if original_path:
+        video_file = Path(original_path)
         if video_file.exists():
+            # The probe cache key needs the file's stat, so drop it first
+            video_processor.forget_probe(original_path)
             video_file.unlink()
 
     # Delete frames directory (includes thumbnail)
@@ -196,97 +255,3 @@ async def delete_video(
     logger.info("video_deleted", video_id=str(video_id))
 
     return {"message": "Video deleted successfully"}
-
-
-async def process_video_task(
-    video_id: UUID,
-    video_path: str,
-    video_processor: VideoProcessorService,
-    audio_extractor: AudioExtractorService,
-    transcription: TranscriptionService,
-    embedding: EmbeddingService,
-    vector_store: VectorStoreService,
-) -> None:
-    """Background task to process a video."""
-
-    async with async_session_factory() as session:
-        try:
-            result = await session.execute(select(Video).where(Video.id == video_id))
-            video: Video | None = result.scalar_one_or_none()
-
-            if not video:
-                logger.error("video_not_found", video_id=str(video_id))
-                return
-
-            # Step 1: Extract keyframes
-            video.mark_processing(VideoStatus.EXTRACTING_FRAMES)
-            await session.commit()
-
-            keyframes = video_processor.extract_keyframes(video_path, video_id)
-            video.keyframe_count = len(keyframes)
-            video.frame_count = video_processor.count_frames(video_path)
-            await session.commit()
-
-            # Step 2: Extract audio and transcribe
-            video.mark_processing(VideoStatus.EXTRACTING_AUDIO)
-            await session.commit()
-
-            has_audio = audio_extractor.has_audio(video_path)
-            segments = []
-
-            if has_audio:
-                audio_path = audio_extractor.extract_audio(video_path, video_id)
-
-                video.mark_processing(VideoStatus.TRANSCRIBING)
-                await session.commit()
-
-                segments = transcription.transcribe(audio_path)
-
-                # Save transcripts to database
-                for seg in segments:
-                    transcript = Transcript(
-                        video_id=video_id,
-                        text=seg["text"],
-                        start_time=seg["start_time"],
-                        end_time=seg["end_time"],
-                        confidence=seg.get("confidence"),
-                        language=seg.get("language"),
-                    )
-                    session.add(transcript)
-                await session.commit()
-
-            # Step 3: Generate embeddings
-            video.mark_processing(VideoStatus.EMBEDDING)
-            await session.commit()
-
-            # Visual embeddings
-            if keyframes:
-                frame_paths = [kf["frame_path"] for kf in keyframes]
-                visual_embeddings = embedding.embed_images_batch(frame_paths)
-                vector_store.store_visual_embeddings(
-                    video_id, keyframes, visual_embeddings
-                )
-
-            # Speech embeddings
-            if segments:
-                texts = [seg["text"] for seg in segments]
-                speech_embeddings = embedding.embed_texts_batch(texts)
-                vector_store.store_speech_embeddings(
-                    video_id, segments, speech_embeddings
-                )
-
-            # Mark completed
-            video.mark_completed()
-            await session.commit()
-
-            logger.info(
-                "video_processing_complete",
-                video_id=str(video_id),
-                keyframes=len(keyframes),
-                segments=len(segments),
-            )
-
-        except Exception as e:
-            logger.exception("video_processing_failed", video_id=str(video_id))
-            video.mark_failed(str(e))
-            await session.commit()
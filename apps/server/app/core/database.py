@@ -3,8 +3,7 @@
 from collections.abc import AsyncGenerator
 
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlmodel import SQLModel
 
 from .config import get_settings
@@ -18,12 +17,16 @@ async_engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     future=True,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=True,
 )
 
 # Async session factory
-async_session_factory = sessionmaker(
-    bind=async_engine,
-    class_=AsyncSession,
+async_session_factory = async_sessionmaker(
+    async_engine,
     expire_on_commit=False,
     autocommit=False,
     autoflush=False,
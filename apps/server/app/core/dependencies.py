@@ -3,22 +3,29 @@
 from functools import lru_cache
 from typing import Annotated
 
+from arq.connections import ArqRedis
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_session
+from app.core.queue import get_job_queue
 from app.services import (
     VideoProcessorService,
     AudioExtractorService,
     TranscriptionService,
     EmbeddingService,
     VectorStoreService,
+    SearchCacheService,
+    VideoStatusService,
 )
 
 
 # Database session dependency
 SessionDep = Annotated[AsyncSession, Depends(get_session)]
 
+# Job queue dependency (None when Redis isn't configured)
+JobQueueDep = Annotated[ArqRedis | None, Depends(get_job_queue)]
+
 
 # Service singletons
 @lru_cache
@@ -51,9 +58,23 @@ def get_vector_store() -> VectorStoreService:
     return VectorStoreService()
 
 
+@lru_cache
+def get_search_cache() -> SearchCacheService:
+    """Get search cache service."""
+    return SearchCacheService()
+
+
+@lru_cache
+def get_video_status() -> VideoStatusService:
+    """Get video status service."""
+    return VideoStatusService()
+
+
 # Annotated dependencies for cleaner route signatures
 VideoProcessorDep = Annotated[VideoProcessorService, Depends(get_video_processor)]
 AudioExtractorDep = Annotated[AudioExtractorService, Depends(get_audio_extractor)]
 TranscriptionDep = Annotated[TranscriptionService, Depends(get_transcription_service)]
 EmbeddingDep = Annotated[EmbeddingService, Depends(get_embedding_service)]
 VectorStoreDep = Annotated[VectorStoreService, Depends(get_vector_store)]
+SearchCacheDep = Annotated[SearchCacheService, Depends(get_search_cache)]
+VideoStatusDep = Annotated[VideoStatusService, Depends(get_video_status)]
@@ -1,61 +1,107 @@
+import atexit
 import logging
+import queue
 import sys
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+
+import orjson
 import structlog
 from structlog.types import Processor
 
 from .config import get_settings
 
+# Background thread that performs stdlib log writes (see setup_logging)
+_listener: QueueListener | None = None
 
-def setup_logging() -> None:
-    """Configure structured logging for the application."""
-    settings = get_settings()
 
-    # Determine if we're in development or production
-    is_development = settings.app_env == "development"
+def _stop_listener() -> None:
+    """Flush queued stdlib records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
 
+atexit.register(_stop_listener)
+
+
+@lru_cache
+def _build_processors(is_development: bool) -> tuple[Processor, ...]:
+    """Build the structlog processor chain for an environment."""
     # Shared processors for all environments
-    shared_processors: list[Processor] = [
+    shared_processors: tuple[Processor, ...] = (
         structlog.contextvars.merge_contextvars,
         structlog.processors.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.StackInfoRenderer(),
         structlog.processors.UnicodeDecoder(),
-    ]
+    )
 
     if is_development:
         # Development: pretty console output
-        processors: list[Processor] = [
+        return (
             *shared_processors,
             structlog.dev.ConsoleRenderer(colors=True),
-        ]
+        )
+
+    # Production: JSON output for log aggregation, serialized by orjson
+    # straight to bytes
+    return (
+        *shared_processors,
+        structlog.processors.format_exc_info,
+        structlog.processors.JSONRenderer(serializer=orjson.dumps),
+    )
+
+
+def setup_logging() -> None:
+    """Configure structured logging for the application."""
+    settings = get_settings()
+
+    # Determine if we're in development or production
+    is_development = settings.app_env == "development"
+
+    if is_development:
+        logger_factory = structlog.PrintLoggerFactory(file=sys.stdout)
     else:
-        # Production: JSON output for log aggregation
-        processors = [
-            *shared_processors,
-            structlog.processors.format_exc_info,
-            structlog.processors.JSONRenderer(),
-        ]
+        # Bytes go to the buffered writer under sys.stdout, which the stdlib
+        # handler also writes through; both flush every line, so nothing is
+        # held back and lines from the two paths never split each other
+        logger_factory = structlog.BytesLoggerFactory(file=sys.stdout.buffer)
 
     structlog.configure(
-        processors=processors,
+        processors=list(_build_processors(is_development)),
         wrapper_class=structlog.make_filtering_bound_logger(
             logging.DEBUG if settings.debug else logging.INFO
         ),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(file=sys.stdout),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
 
-    # Configure standard library logging to use structlog
+    # Configure standard library logging. Callers only enqueue records; a
+    # single listener thread does the blocking stdout writes.
+    global _listener
+    _stop_listener()
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    _listener = QueueListener(
+        log_queue,
+        logging.StreamHandler(sys.stdout),
+        respect_handler_level=True,
+    )
+    _listener.start()
+
     logging.basicConfig(
         format="%(message)s",
         level=logging.DEBUG if settings.debug else logging.INFO,
-        handlers=[logging.StreamHandler(sys.stdout)],
+        handlers=[QueueHandler(log_queue)],
+        force=True,
     )
 
 
+@lru_cache(maxsize=256)
 def get_logger(name: str | None = None) -> structlog.BoundLogger:
-    """Get a logger instance with optional name binding."""
+    """Get a logger instance with optional name binding (memoized per name)."""
     logger = structlog.get_logger()
     if name:
         logger = logger.bind(logger_name=name)
@@ -0,0 +1,32 @@
+"""Background job queue using arq."""
+
+from arq import create_pool
+from arq.connections import ArqRedis, RedisSettings
+
+from .config import get_settings
+from .logging import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+_pool: ArqRedis | None = None
+
+
+async def get_job_queue() -> ArqRedis | None:
+    """Dependency that provides the shared arq pool, or None without Redis."""
+    global _pool
+    if not settings.redis_url:
+        return None
+
+    if _pool is None:
+        logger.info("connecting_to_job_queue", url=settings.redis_url)
+        _pool = await create_pool(RedisSettings.from_dsn(settings.redis_url))
+    return _pool
+
+
+async def close_job_queue() -> None:
+    """Close the arq pool on shutdown."""
+    global _pool
+    if _pool is not None:
+        await _pool.aclose()
+        _pool = None
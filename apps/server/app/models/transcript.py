@@ -3,7 +3,8 @@
 from datetime import datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import Column, DateTime
+from sqlalchemy import Column, Computed, DateTime, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlmodel import SQLModel, Field, Relationship
 from typing import TYPE_CHECKING
 
@@ -17,9 +18,19 @@ class Transcript(SQLModel, table=True):
     """Transcript segment model."""
 
     __tablename__ = "transcripts"
+    __table_args__ = (
+        # Timeline reads filter by video and order by time; this also serves
+        # plain video_id lookups
+        Index("ix_transcripts_video_id_start_time", "video_id", "start_time"),
+        Index(
+            "ix_transcripts_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+    )
 
     id: UUID = Field(default_factory=uuid4, primary_key=True)
-    video_id: UUID = Field(foreign_key="videos.id", index=True)
+    video_id: UUID = Field(foreign_key="videos.id")
 
     text: str
     start_time: float  # Start time in seconds
@@ -28,16 +39,25 @@ class Transcript(SQLModel, table=True):
     confidence: float | None = None
     language: str | None = None
 
-    # For full-text search
-    search_vector: str | None = Field(default=None, sa_column_kwargs={"index": True})
+    # For full-text search; generated by Postgres from text, never written
+    search_vector: str | None = Field(
+        default=None,
+        sa_column=Column(
+            TSVECTOR,
+            Computed("to_tsvector('english', text)", persisted=True),
+        ),
+    )
 
     created_at: datetime = Field(
         default_factory=utc_now,
         sa_column=Column(DateTime(timezone=True), nullable=False),
     )
 
-    # Relationships
-    video: "Video" = Relationship(back_populates="transcripts")
+    # Relationships (lazy loads raise; use selectinload() where needed)
+    video: "Video" = Relationship(
+        back_populates="transcripts",
+        sa_relationship_kwargs={"lazy": "raise"},
+    )
 
     @property
     def duration(self) -> float:
@@ -4,7 +4,8 @@ from datetime import datetime
 from enum import Enum
 from uuid import UUID, uuid4
 
-from sqlalchemy import Column, DateTime
+from sqlalchemy import Column, DateTime, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import SQLModel, Field, Relationship
 from typing import TYPE_CHECKING
 
@@ -61,8 +62,38 @@ class Video(SQLModel, table=True):
         sa_column=Column(DateTime(timezone=True), nullable=True),
     )
 
-    # Relationships
-    transcripts: list["Transcript"] = Relationship(back_populates="video")
+    # Relationships (lazy loads raise; use selectinload() where needed)
+    transcripts: list["Transcript"] = Relationship(
+        back_populates="video",
+        sa_relationship_kwargs={"lazy": "raise"},
+    )
+
+    @classmethod
+    async def set_status(
+        cls,
+        session: AsyncSession,
+        video_id: UUID,
+        status: VideoStatus,
+        error_message: str | None = None,
+    ) -> datetime | None:
+        """
+        Set status with a single UPDATE ... RETURNING, bypassing the ORM flush.
+
+        Returns the new updated_at, or None if the video doesn't exist. Loaded
+        instances are not synchronized; the caller commits.
+        """
+        values: dict = {"status": status, "updated_at": utc_now()}
+        if error_message is not None:
+            values["error_message"] = error_message
+
+        result = await session.execute(
+            update(cls)
+            .where(cls.id == video_id)
+            .values(**values)
+            .returning(cls.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalar_one_or_none()
 
     def mark_processing(self, status: VideoStatus) -> None:
         """Update status and timestamp."""
@@ -72,8 +103,7 @@ class Video(SQLModel, table=True):
     def mark_completed(self) -> None:
         """Mark video as successfully processed."""
         self.status = VideoStatus.COMPLETED
-        self.updated_at = utc_now()
-        self.processed_at = utc_now()
+        self.updated_at = self.processed_at = utc_now()
 
     def mark_failed(self, error: str) -> None:
         """Mark video as failed with error message."""
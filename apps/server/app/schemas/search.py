@@ -2,7 +2,7 @@
 
 from enum import Enum
 from uuid import UUID
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class SearchType(str, Enum):
@@ -16,15 +16,20 @@ class SearchType(str, Enum):
 class SearchQuery(BaseModel):
     """Search query schema."""
 
+    model_config = ConfigDict(frozen=True)
+
     query: str = Field(..., min_length=1, max_length=500)
     search_type: SearchType = SearchType.HYBRID
     limit: int = Field(default=10, ge=1, le=50)
     threshold: float = Field(default=0.1, ge=0.0, le=1.0)
+    ef_search: int | None = Field(default=None, ge=1, le=1024)  # HNSW recall/speed
 
 
 class SearchResult(BaseModel):
     """Individual search result."""
 
+    model_config = ConfigDict(frozen=True)
+
     video_id: UUID
     video_filename: str
     timestamp: float  # In seconds
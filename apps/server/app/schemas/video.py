@@ -10,7 +10,7 @@ from app.models.video import VideoStatus
 class VideoRead(BaseModel):
     """Schema for reading video data."""
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
     id: UUID
     filename: str
@@ -5,6 +5,8 @@ from .audio_extractor import AudioExtractorService
 from .transcription import TranscriptionService
 from .embedding import EmbeddingService
 from .vector_store import VectorStoreService
+from .search_cache import SearchCacheService
+from .video_status import VideoStatusService
 
 __all__ = [
     "VideoProcessorService",
@@ -12,4 +14,6 @@ __all__ = [
     "TranscriptionService",
     "EmbeddingService",
     "VectorStoreService",
+    "SearchCacheService",
+    "VideoStatusService",
 ]
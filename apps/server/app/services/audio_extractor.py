@@ -1,9 +1,11 @@
 """Audio extraction service."""
 
-import subprocess
-from pathlib import Path
+import asyncio
+import wave
 from uuid import UUID
 
+import numpy as np
+
 from app.core.config import get_settings
 from app.core.logging import get_logger
 
@@ -18,16 +20,17 @@ class AudioExtractorService:
         """Initialize audio extractor."""
         self.audio_dir = settings.audio_dir
 
-    def extract_audio(
+    async def extract_audio(
         self,
         video_path: str,
         video_id: UUID,
         sample_rate: int = 16000,
-    ) -> str:
+    ) -> np.ndarray:
         """
         Extract audio track from video.
 
-        Returns path to extracted audio file.
+        Returns mono float32 samples in [-1, 1] at sample_rate, decoded from
+        ffmpeg's stdout without an intermediate file.
         """
         logger.info(
             "extracting_audio",
@@ -36,44 +39,60 @@ class AudioExtractorService:
             sample_rate=sample_rate,
         )
 
-        # Create output directory
-        output_dir = self.audio_dir / str(video_id)
-        output_dir.mkdir(parents=True, exist_ok=True)
-
-        output_path = output_dir / "audio.wav"
-
         cmd = [
             "ffmpeg",
+            "-threads",
+            "0",  # Let ffmpeg pick the thread count per file
             "-i",
             video_path,
             "-vn",  # No video
-            "-acodec",
-            "pcm_s16le",  # PCM 16-bit
+            "-f",
+            "s16le",  # Raw PCM 16-bit
             "-ar",
             str(sample_rate),  # Sample rate
             "-ac",
             "1",  # Mono
-            "-y",  # Overwrite
-            str(output_path),
+            "pipe:1",
         ]
 
+        # Run ffmpeg without tying up a thread-pool slot for its wall time
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
         try:
-            subprocess.run(
-                cmd,
-                capture_output=True,
-                check=True,
-            )
-            logger.info("audio_extracted", output_path=str(output_path))
-            return str(output_path)
-
-        except subprocess.CalledProcessError as e:
-            logger.error(
-                "audio_extraction_failed",
-                error=e.stderr.decode() if e.stderr else str(e),
-            )
-            raise RuntimeError(f"Failed to extract audio: {e}")
-
-    def has_audio(self, video_path: str) -> bool:
+            pcm, stderr = await proc.communicate()
+        except asyncio.CancelledError:
+            proc.kill()
+            raise
+
+        if proc.returncode != 0:
+            error = stderr.decode(errors="replace")
+            logger.error("audio_extraction_failed", error=error)
+            raise RuntimeError(f"Failed to extract audio: {error}")
+
+        if settings.debug:
+            self._write_wav(pcm, video_id, sample_rate)
+
+        audio = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        logger.info("audio_extracted", samples=len(audio))
+        return audio
+
+    def _write_wav(self, pcm: bytes, video_id: UUID, sample_rate: int) -> None:
+        """Keep a copy of the extracted audio on disk for debugging."""
+        output_dir = self.audio_dir / str(video_id)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        output_path = output_dir / "audio.wav"
+        with wave.open(str(output_path), "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            wav.writeframes(pcm)
+        logger.debug("audio_written", output_path=str(output_path))
+
+    async def has_audio(self, video_path: str) -> bool:
         """Check if video has an audio track."""
         cmd = [
             "ffprobe",
@@ -88,8 +107,10 @@ class AudioExtractorService:
             video_path,
         ]
 
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            return bool(result.stdout.strip())
-        except subprocess.CalledProcessError:
-            return False
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        stdout, _ = await proc.communicate()
+        return proc.returncode == 0 and bool(stdout.strip())
@@ -1,8 +1,18 @@
 """Embedding service for visual and text embeddings."""
 
+import asyncio
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+import numpy as np
 import torch
-from PIL import Image
-from transformers import AutoProcessor, AutoModel
+import torch.nn.functional as F
+from torchvision.io import ImageReadMode, decode_jpeg, read_file
+from transformers import AutoProcessor, AutoModel, BitsAndBytesConfig
 from sentence_transformers import SentenceTransformer
 
 from app.core.config import get_settings
@@ -11,6 +21,87 @@ from app.core.logging import get_logger
 logger = get_logger(__name__)
 settings = get_settings()
 
+# SigLIP2 text inputs are always padded to this many tokens. The text tower
+# pools the hidden state at the last position and was trained on max_length
+# padding, so shorter or dynamic padding changes the embeddings.
+TEXT_MAX_LENGTH = 64
+
+# Sentence-transformer length buckets: upper token bound -> batch size multiplier.
+# Shorter texts pad to less, so their batches can be proportionally larger.
+TEXT_LENGTH_BUCKETS = np.array([16, 32, 64, 128])
+TEXT_BUCKET_BATCH_MULTIPLIERS = (8, 4, 2, 1, 1)  # Last entry: longer than 128
+
+# PIL resampling filters (the image processor's `resample`) by interpolate mode
+PIL_RESAMPLE_MODES = {0: "nearest-exact", 2: "bilinear", 3: "bicubic"}
+
+
+class _TextBatcher:
+    """
+    Coalesces concurrent single-query embedding requests into one batch.
+
+    Requests wait up to text_embedding_max_wait_ms for others to arrive, then
+    run as a single forward in a worker thread. Results are LRU-cached.
+    """
+
+    def __init__(self, embed_batch: Callable[[list[str]], np.ndarray]) -> None:
+        self._embed_batch = embed_batch
+        self._queue: asyncio.Queue[tuple[str, asyncio.Future]] | None = None
+        self._task: asyncio.Task | None = None
+        self._cache: OrderedDict[str, np.ndarray] = OrderedDict()
+
+    async def embed(self, text: str) -> np.ndarray:
+        """Embed one text, batched with any concurrent requests."""
+        cached = self._cache.get(text)
+        if cached is not None:
+            self._cache.move_to_end(text)
+            return cached
+
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run(self._queue))
+
+        future = loop.create_future()
+        self._queue.put_nowait((text, future))
+        embedding = await future
+
+        self._cache[text] = embedding
+        if len(self._cache) > settings.query_embedding_cache_size:
+            self._cache.popitem(last=False)
+        return embedding
+
+    async def _run(self, queue: asyncio.Queue[tuple[str, asyncio.Future]]) -> None:
+        loop = asyncio.get_running_loop()
+        max_wait = settings.text_embedding_max_wait_ms / 1000
+
+        while True:
+            items = [await queue.get()]
+            deadline = loop.time() + max_wait
+            while len(items) < settings.text_embedding_max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(queue.get(), timeout))
+                except TimeoutError:
+                    break
+
+            try:
+                embeddings = await asyncio.to_thread(
+                    self._embed_batch, [text for text, _ in items]
+                )
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            # Rows are shared through the cache, so hand them out read-only
+            embeddings.setflags(write=False)
+            for (_, future), embedding in zip(items, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+
 
 class EmbeddingService:
     """Service for generating embeddings from images and text."""
@@ -21,24 +112,139 @@ class EmbeddingService:
         self._model: AutoModel | None = None
         self._sentence_model: SentenceTransformer | None = None
         self._device = "cuda" if torch.cuda.is_available() else "cpu"
+        # Half precision only pays off on GPU; CPU kernels are fastest in fp32
+        self._dtype = torch.float16 if self._device == "cuda" else torch.float32
+        # Image preprocessing constants, materialized on device in load_models()
+        self._image_size: tuple[int, int] | None = None
+        self._resize_mode = "bicubic"
+        self._pixel_scale: torch.Tensor | None = None
+        self._pixel_shift: torch.Tensor | None = None
+        # SigLIP forwards, replaced with compiled versions in load_models()
+        self._image_features: Callable[..., torch.Tensor] | None = None
+        self._text_features: Callable[..., torch.Tensor] | None = None
+        # CUDA graphs of the text forward keyed by batch bucket, with pinned
+        # host staging for their token inputs; replays share static buffers,
+        # so they are serialized with a lock
+        self._text_graphs: dict[
+            int,
+            tuple[
+                torch.cuda.CUDAGraph,
+                dict[str, torch.Tensor],
+                dict[str, torch.Tensor],
+                torch.Tensor,
+            ],
+        ] = {}
+        self._text_graph_lock = threading.Lock()
+        # Pinned host buffer for image embeddings (CUDA only), see _copy_to_host()
+        self._host_buffer: torch.Tensor | None = None
+        self._host_buffer_lock = threading.Lock()
+        # File reads and CPU JPEG decodes release the GIL, so they run in parallel
+        self._io_pool = ThreadPoolExecutor(
+            max_workers=settings.image_load_workers, thread_name_prefix="image-load"
+        )
+        # Micro-batchers for query embeddings from concurrent requests
+        self._text_batcher = _TextBatcher(self.embed_texts_batch)
+        self._text_visual_batcher = _TextBatcher(self.embed_texts_visual_batch)
+
+    def load_models(self, warm_vision: bool = True) -> None:
+        """
+        Preload all models. Must be called at startup; repeat calls are no-ops.
+
+        warm_vision: compile and warm up the image path too; processes that
+        never embed frames can skip it to save startup time and VRAM
+        """
+        # The sentence model loads last, so it marks a completed load
+        if self._sentence_model is not None:
+            return
 
-    def load_models(self) -> None:
-        """Preload all models. Must be called at startup."""
         logger.info("loading_embedding_models", device=self._device)
 
+        if self._device == "cpu":
+            torch.set_num_threads(os.cpu_count() or 1)
+
         # Load SigLIP2 (unified model for both vision and text)
         logger.info("loading_siglip2_model", model=settings.siglip_model)
         self._processor = AutoProcessor.from_pretrained(
             settings.siglip_model,
             use_fast=True,
         )
-        self._model = AutoModel.from_pretrained(
-            settings.siglip_model,
-            dtype=torch.float16,
-            attn_implementation="sdpa",
-        ).to(self._device)
+        quantize = settings.siglip_vision_int8 and self._device == "cuda"
+        if quantize:
+            # int8 weights for the vision tower only; the small text tower and
+            # projection heads stay in fp16
+            logger.info("quantizing_siglip2_vision_int8")
+            self._model = AutoModel.from_pretrained(
+                settings.siglip_model,
+                dtype=self._dtype,
+                attn_implementation="sdpa",
+                quantization_config=BitsAndBytesConfig(
+                    load_in_8bit=True,
+                    llm_int8_skip_modules=["text_model", "head"],
+                ),
+                device_map=self._device,
+            )
+        else:
+            self._model = AutoModel.from_pretrained(
+                settings.siglip_model,
+                dtype=self._dtype,
+                attn_implementation="sdpa",
+            ).to(self._device)
         self._model.eval()
 
+        self._image_features = self._model.get_image_features
+        self._text_features = self._model.get_text_features
+        # bitsandbytes kernels don't trace under torch.compile
+        if settings.embedding_compile and self._device == "cuda" and not quantize:
+            # Autotuned kernels with fused layernorm/GELU/matmul epilogues; the
+            # compiled text forward is what gets captured into CUDA graphs
+            logger.info("compiling_siglip2_model", mode=settings.embedding_compile_mode)
+            self._image_features = torch.compile(
+                self._image_features, mode=settings.embedding_compile_mode
+            )
+            self._text_features = torch.compile(
+                self._text_features, mode=settings.embedding_compile_mode
+            )
+
+        if settings.text_cuda_graphs and self._device == "cuda":
+            self._capture_text_graphs()
+
+        # Fold SigLIP's rescale + normalize into one multiply-add:
+        # (x / 255 - mean) / std == x * scale + shift
+        image_processor = self._processor.image_processor
+        mean = torch.tensor(image_processor.image_mean, device=self._device)
+        std = torch.tensor(image_processor.image_std, device=self._device)
+        self._image_size = (
+            image_processor.size["height"],
+            image_processor.size["width"],
+        )
+        self._pixel_scale = (1.0 / (255.0 * std)).view(1, 3, 1, 1)
+        self._pixel_shift = (-mean / std).view(1, 3, 1, 1)
+        # Resize with the processor's PIL filter; filters interpolate lacks
+        # (lanczos, box, hamming) use bicubic, the closest match
+        self._resize_mode = PIL_RESAMPLE_MODES.get(
+            int(image_processor.resample), "bicubic"
+        )
+
+        if self._device == "cuda":
+            # Dummy forwards initialize CUDA/cuDNN (and trigger torch.compile)
+            # at startup instead of on the first video or query
+            torch.backends.cudnn.benchmark = True
+            logger.info("warming_up_siglip2_model", vision=warm_vision)
+            with self._inference():
+                if warm_vision:
+                    self._warm_up_vision()
+                if not self._text_graphs:
+                    # Graph capture already ran the text forward
+                    self._get_text_features()(
+                        **self._get_processor()(
+                            text=[""],
+                            padding="max_length",
+                            max_length=TEXT_MAX_LENGTH,
+                            return_tensors="pt",
+                        ).to(self._device)
+                    )
+            torch.cuda.synchronize()
+
         # Load sentence transformer for speech embeddings
         logger.info("loading_sentence_model", model=settings.sentence_transformer_model)
         self._sentence_model = SentenceTransformer(
@@ -48,6 +254,97 @@ class EmbeddingService:
 
         logger.info("embedding_models_loaded")
 
+    def _inference(self) -> ExitStack:
+        """
+        Context for SigLIP forwards: inference mode, plus fp16 autocast on CUDA.
+
+        Weights are already fp16 on CUDA; autocast keeps precision-sensitive ops
+        (softmax, layer norm) in fp32. Its weight cache is disabled so the same
+        context is safe inside CUDA graph capture.
+        """
+        stack = ExitStack()
+        stack.enter_context(torch.inference_mode())
+        if self._device == "cuda":
+            stack.enter_context(
+                torch.autocast("cuda", dtype=torch.float16, cache_enabled=False)
+            )
+        return stack
+
+    def _warm_up_vision(self) -> None:
+        """Allocate the pinned copy buffer and run the image forward once."""
+        # Pinned staging buffer for async device-to-host embedding copies
+        self._host_buffer = torch.empty(
+            (settings.image_embedding_batch_size, settings.visual_embedding_dim),
+            dtype=self._dtype,
+            pin_memory=True,
+        )
+
+        # A dynamic batch dim compiles one graph for the full batches and any
+        # partial tail; batches of one are always specialized, so warm that too
+        for batch_size in sorted(
+            {settings.image_embedding_batch_size, 1}, reverse=True
+        ):
+            pixel_values = torch.zeros(
+                (batch_size, 3, *self._image_size),
+                dtype=self._dtype,
+                device=self._device,
+            )
+            if batch_size > 1:
+                torch._dynamo.mark_dynamic(pixel_values, 0)
+            self._get_image_features()(pixel_values=pixel_values)
+
+    def _capture_text_graphs(self) -> None:
+        """
+        Capture CUDA graphs of the SigLIP2 text forward.
+
+        Query text is padded to TEXT_MAX_LENGTH, so shapes are static apart from
+        the batch size; one graph is captured per power-of-two batch bucket up
+        to text_embedding_max_batch and smaller batches are padded up.
+        """
+        sample = self._get_processor()(
+            text=[""],
+            padding="max_length",
+            max_length=TEXT_MAX_LENGTH,
+            return_tensors="pt",
+        )
+        buckets = sorted(
+            {
+                *(2**i for i in range(settings.text_embedding_max_batch.bit_length())),
+                settings.text_embedding_max_batch,
+            }
+        )
+        logger.info("capturing_text_cuda_graphs", buckets=buckets)
+
+        forward = self._get_text_features()
+        pool = torch.cuda.graph_pool_handle()
+        for bucket in buckets:
+            static_inputs = {
+                k: v.repeat(bucket, 1).to(self._device) for k, v in sample.items()
+            }
+
+            # Warm up on a side stream before capture, as CUDA graphs require
+            stream = torch.cuda.Stream()
+            stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(stream), self._inference():
+                for _ in range(3):
+                    forward(**static_inputs)
+            torch.cuda.current_stream().wait_stream(stream)
+
+            graph = torch.cuda.CUDAGraph()
+            with self._inference(), torch.cuda.graph(graph, pool=pool):
+                static_output = forward(**static_inputs)
+
+            pinned_inputs = {
+                k: torch.empty_like(v, device="cpu").pin_memory()
+                for k, v in static_inputs.items()
+            }
+            self._text_graphs[bucket] = (
+                graph,
+                static_inputs,
+                pinned_inputs,
+                static_output,
+            )
+
     def _get_model(self) -> AutoModel:
         if self._model is None:
             raise RuntimeError("Models not loaded. Call load_models() first.")
@@ -58,97 +355,246 @@ class EmbeddingService:
             raise RuntimeError("Models not loaded. Call load_models() first.")
         return self._processor
 
+    def _get_image_features(self) -> Callable[..., torch.Tensor]:
+        if self._image_features is None:
+            raise RuntimeError("Models not loaded. Call load_models() first.")
+        return self._image_features
+
+    def _get_text_features(self) -> Callable[..., torch.Tensor]:
+        if self._text_features is None:
+            raise RuntimeError("Models not loaded. Call load_models() first.")
+        return self._text_features
+
     def _get_sentence_model(self) -> SentenceTransformer:
         if self._sentence_model is None:
             raise RuntimeError("Models not loaded. Call load_models() first.")
         return self._sentence_model
 
-    def embed_image(self, image_path: str) -> list[float]:
-        """Generate embedding for an image using SigLIP2."""
-        image = Image.open(image_path).convert("RGB")
-        inputs = self._get_processor()(images=image, return_tensors="pt").to(
-            self._device
+    def _load_image(self, image_path: str) -> torch.Tensor:
+        """Decode a JPEG frame straight onto the model device (nvJPEG on GPU)."""
+        data = read_file(image_path)
+        return decode_jpeg(data, mode=ImageReadMode.RGB, device=self._device)
+
+    def _read_image(self, image_path: str) -> torch.Tensor | None:
+        """Read an encoded frame, logging and returning None on failure."""
+        try:
+            return read_file(image_path)
+        except Exception as e:
+            logger.error("image_load_failed", path=image_path, error=str(e))
+            return None
+
+    def _decode_image(self, image_path: str, data: torch.Tensor) -> torch.Tensor | None:
+        """Decode one frame, logging and returning None on failure."""
+        try:
+            return decode_jpeg(data, mode=ImageReadMode.RGB, device=self._device)
+        except Exception as e:
+            logger.error("image_load_failed", path=image_path, error=str(e))
+            return None
+
+    def _load_images(
+        self, image_paths: list[str]
+    ) -> tuple[list[torch.Tensor], list[int]]:
+        """
+        Decode a batch of frames, logging and skipping unreadable ones.
+
+        Returns the decoded images and their indices into image_paths.
+        """
+        read = list(self._io_pool.map(self._read_image, image_paths))
+        kept = [i for i, data in enumerate(read) if data is not None]
+        encoded = [read[i] for i in kept]
+
+        if not encoded:
+            return [], []
+
+        # One batched nvJPEG call on CUDA; a corrupt frame fails the whole call,
+        # so fall back to per-image decoding to find and skip it
+        if self._device == "cuda":
+            try:
+                images = decode_jpeg(
+                    encoded, mode=ImageReadMode.RGB, device=self._device
+                )
+                return images, kept
+            except Exception:
+                pass
+
+        images = self._io_pool.map(
+            self._decode_image, [image_paths[i] for i in kept], encoded
         )
+        decoded = [(i, image) for i, image in zip(kept, images) if image is not None]
+        return [image for _, image in decoded], [i for i, _ in decoded]
 
-        with torch.no_grad():
-            image_features = self._get_model().get_image_features(**inputs)
+    def _pixel_values(self, images: list[torch.Tensor]) -> torch.Tensor:
+        """Resize and normalize decoded images on device, like the SigLIP2 processor."""
+        if self._image_size is None:
+            raise RuntimeError("Models not loaded. Call load_models() first.")
 
-        return image_features[0].cpu().float().numpy().tolist()
+        with torch.inference_mode():
+            # Keyframes of one video share a resolution, so normally the whole
+            # batch is stacked and resized in one kernel launch
+            if all(image.shape == images[0].shape for image in images):
+                groups = [torch.stack(images)]
+            else:
+                groups = [image.unsqueeze(0) for image in images]
+
+            # antialias matches PIL's downscaling (nearest has no such option);
+            # PIL also rounds and clamps its output back to uint8
+            antialias = self._resize_mode != "nearest-exact"
+            resized = torch.cat(
+                [
+                    F.interpolate(
+                        group.float(),
+                        size=self._image_size,
+                        mode=self._resize_mode,
+                        antialias=antialias,
+                    )
+                    for group in groups
+                ]
+            )
+            resized = resized.round_().clamp_(0, 255)
+            pixel_values = torch.addcmul(self._pixel_shift, resized, self._pixel_scale)
+        return pixel_values.to(self._dtype)
+
+    def embed_image(self, image_path: str) -> np.ndarray:
+        """Generate embedding for an image using SigLIP2 (float32 vector)."""
+        pixel_values = self._pixel_values([self._load_image(image_path)])
+
+        with self._inference():
+            image_features = self._get_image_features()(pixel_values=pixel_values)
+
+        return image_features[0].to(torch.float32).cpu().numpy()
+
+    def _copy_to_host(self, features: torch.Tensor, dest: np.ndarray) -> None:
+        """Copy embeddings into dest, via the pinned buffer when available."""
+        buffer = self._host_buffer
+        if buffer is None or features.shape[0] > buffer.shape[0]:
+            dest[:] = features.to(torch.float32).cpu().numpy()
+            return
+
+        with self._host_buffer_lock:
+            staging = buffer[: features.shape[0]]
+            staging.copy_(features, non_blocking=True)
+            torch.cuda.current_stream().synchronize()
+            dest[:] = staging.numpy()
 
     def embed_images_batch(
         self,
         image_paths: list[str],
-        batch_size: int = 16,
-    ) -> list[list[float]]:
-        """Generate embeddings for multiple images in batches."""
+        batch_size: int = settings.image_embedding_batch_size,
+    ) -> tuple[np.ndarray, list[int]]:
+        """
+        Generate embeddings for multiple images in batches.
+
+        Returns a float32 array of shape (N, D) and, for each row, its index
+        into image_paths; images that fail to load are skipped, so N may be
+        smaller than len(image_paths).
+        """
         logger.info("embedding_images_batch", count=len(image_paths))
-        all_embeddings = []
+        # Filled batch by batch to avoid per-element Python floats
+        out = np.empty(
+            (len(image_paths), settings.visual_embedding_dim), dtype=np.float32
+        )
+        count = 0
+        kept: list[int] = []
 
-        model = self._get_model()
-        processor = self._get_processor()
+        image_features_fn = self._get_image_features()
+        starts = range(0, len(image_paths), batch_size)
+        batches = [image_paths[start : start + batch_size] for start in starts]
+        if not batches:
+            return out, kept
 
-        for i in range(0, len(image_paths), batch_size):
-            batch_paths = image_paths[i : i + batch_size]
-            images = []
-            for p in batch_paths:
-                try:
-                    images.append(Image.open(p).convert("RGB"))
-                except Exception as e:
-                    logger.error("image_load_failed", path=p, error=str(e))
+        # Read and decode batch N+1 in the background while batch N runs
+        with ThreadPoolExecutor(max_workers=1) as prefetch:
+            pending = prefetch.submit(self._load_images, batches[0])
+            for start, next_paths in zip(starts, [*batches[1:], None]):
+                images, indices = pending.result()
+                if next_paths is not None:
+                    pending = prefetch.submit(self._load_images, next_paths)
+
+                if not images:
                     continue
 
-            if not images:
-                continue
+                # The HF processor is bypassed here; it resizes serially on CPU
+                pixel_values = self._pixel_values(images)
 
-            inputs = processor(images=images, return_tensors="pt", padding=True).to(
-                self._device
-            )
+                with self._inference():
+                    image_features = image_features_fn(pixel_values=pixel_values)
 
-            with torch.no_grad():
-                image_features = model.get_image_features(**inputs)
-                embeddings = image_features.cpu().float().numpy().tolist()
-                all_embeddings.extend(embeddings)
+                self._copy_to_host(image_features, out[count : count + len(images)])
+                count += len(images)
+                kept.extend(start + i for i in indices)
 
-        return all_embeddings
+        return out[:count], kept
 
-    def embed_text_visual(self, text: str) -> list[float]:
+    async def embed_text_visual_async(self, text: str) -> np.ndarray:
         """Generate visual-compatible embedding for text queries (SigLIP2)."""
         # IMPORTANT: Model was trained with lowercased text
-        text = text.lower()
+        return await self._text_visual_batcher.embed(text.lower())
 
+    def embed_texts_visual_batch(self, texts: list[str]) -> np.ndarray:
+        """Generate SigLIP2 text embeddings for already-lowercased texts (float32)."""
         inputs = self._get_processor()(
-            text=[text],
+            text=texts,
             padding="max_length",
-            max_length=64,
+            max_length=TEXT_MAX_LENGTH,
             return_tensors="pt",
-        ).to(self._device)
+        )
 
-        with torch.no_grad():
-            text_features = self._get_model().get_text_features(**inputs)
+        bucket = next((b for b in self._text_graphs if b >= len(texts)), None)
+        if bucket is not None:
+            graph, static_inputs, pinned_inputs, static_output = self._text_graphs[
+                bucket
+            ]
+            with self._text_graph_lock, torch.inference_mode():
+                # Rows past len(texts) hold stale inputs; their outputs are unused.
+                # Tokens go through pinned memory so the upload is a true async
+                # copy; the .cpu() below syncs before the lock is released
+                for k, v in inputs.items():
+                    staged = pinned_inputs[k][: len(texts)]
+                    staged.copy_(v)
+                    static_inputs[k][: len(texts)].copy_(staged, non_blocking=True)
+                graph.replay()
+                text_features = static_output[: len(texts)].to(torch.float32).cpu()
+            return text_features.numpy()
 
-        return text_features[0].cpu().float().numpy().tolist()
+        inputs = inputs.to(self._device)
+        with self._inference():
+            text_features = self._get_text_features()(**inputs)
 
-    def embed_text(self, text: str) -> list[float]:
+        return text_features.to(torch.float32).cpu().numpy()
+
+    async def embed_text_async(self, text: str) -> np.ndarray:
         """Generate text embedding for semantic search (Sentence-Transformers)."""
-        embedding = self._get_sentence_model().encode(
-            text,
-            convert_to_numpy=True,
-            normalize_embeddings=True,
-        )
-        return embedding.tolist()
+        return await self._text_batcher.embed(text)
 
     def embed_texts_batch(
         self,
         texts: list[str],
         batch_size: int = 32,
-    ) -> list[list[float]]:
-        """Generate embeddings for multiple texts using sentence-transformers."""
+    ) -> np.ndarray:
+        """
+        Generate embeddings for multiple texts using sentence-transformers.
+
+        Texts are grouped into token-length buckets so each batch pads only to
+        its bucket's bound. Returns a float32 array of shape (N, D) in input order.
+        """
         logger.info("embedding_texts_batch", count=len(texts))
-        embeddings = self._get_sentence_model().encode(
-            texts,
-            batch_size=batch_size,
-            convert_to_numpy=True,
-            normalize_embeddings=True,
-            show_progress_bar=False,
-        )
-        return embeddings.tolist()
+        model = self._get_sentence_model()
+        dim = model.get_sentence_embedding_dimension()
+        if not texts:
+            return np.empty((0, dim), dtype=np.float32)
+
+        token_ids = model.tokenizer(texts, truncation=True)["input_ids"]
+        lengths = np.fromiter(map(len, token_ids), dtype=np.int64, count=len(texts))
+        buckets = np.searchsorted(TEXT_LENGTH_BUCKETS, lengths)
+
+        out = np.empty((len(texts), dim), dtype=np.float32)
+        for bucket in np.unique(buckets):
+            indices = np.flatnonzero(buckets == bucket)
+            out[indices] = model.encode(
+                [texts[i] for i in indices],
+                batch_size=batch_size * TEXT_BUCKET_BATCH_MULTIPLIERS[bucket],
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+        return out
@@ -0,0 +1,93 @@
+"""Search result cache using Redis."""
+
+import hashlib
+
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# Key prefix shared by all cached search results
+KEY_PREFIX = "search:"
+
+
+class SearchCacheService:
+    """Service for caching raw vector search hits in Redis."""
+
+    def __init__(self) -> None:
+        """Initialize search cache."""
+        self._client: Redis | None = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether a Redis URL is configured."""
+        return bool(settings.redis_url)
+
+    @property
+    def client(self) -> Redis:
+        """Lazy load Redis client."""
+        if self._client is None:
+            logger.info("connecting_to_redis", url=settings.redis_url)
+            self._client = Redis.from_url(settings.redis_url)
+        return self._client
+
+    @staticmethod
+    def make_key(
+        search_type: str,
+        query: str,
+        limit: int,
+        threshold: float,
+        ef_search: int | None = None,
+    ) -> str:
+        """Build a cache key for a normalized search query."""
+        digest = hashlib.sha1(query.strip().lower().encode()).hexdigest()
+        return f"{KEY_PREFIX}{search_type}:{digest}:{limit}:{threshold}:{ef_search}"
+
+    async def get(self, key: str) -> list[dict] | None:
+        """Return cached search hits, or None on miss."""
+        if not self.enabled:
+            return None
+
+        try:
+            cached = await self.client.get(key)
+        except RedisError as e:
+            logger.warning("search_cache_get_failed", error=str(e))
+            return None
+
+        return orjson.loads(cached) if cached is not None else None
+
+    async def set(self, key: str, results: list[dict]) -> None:
+        """Cache search hits with the configured TTL."""
+        if not self.enabled:
+            return
+
+        try:
+            await self.client.setex(
+                key, settings.search_cache_ttl, orjson.dumps(results)
+            )
+        except RedisError as e:
+            logger.warning("search_cache_set_failed", error=str(e))
+
+    async def invalidate(self) -> None:
+        """Drop all cached search results (e.g. after the index changes)."""
+        if not self.enabled:
+            return
+
+        try:
+            keys = [key async for key in self.client.scan_iter(f"{KEY_PREFIX}*")]
+            if keys:
+                await self.client.delete(*keys)
+            logger.info("search_cache_invalidated", count=len(keys))
+        except RedisError as e:
+            logger.warning("search_cache_invalidate_failed", error=str(e))
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
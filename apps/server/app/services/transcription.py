@@ -1,6 +1,8 @@
 """Transcription service using faster-whisper."""
 
-from faster_whisper import WhisperModel
+import ctranslate2
+import numpy as np
+from faster_whisper import BatchedInferencePipeline, WhisperModel
 
 from app.core.config import get_settings
 from app.core.logging import get_logger
@@ -14,19 +16,34 @@ class TranscriptionService:
 
     def __init__(self) -> None:
         """Initialize transcription service."""
-        self._model: WhisperModel | None = None
+        self._model: BatchedInferencePipeline | None = None
 
     def load_models(self) -> None:
-        """Preload Whisper model. Must be called at startup."""
-        logger.info("loading_whisper_model", model=settings.whisper_model)
-        self._model = WhisperModel(
-            settings.whisper_model,
-            device="auto",
-            compute_type="auto",
+        """Preload Whisper model. Must be called at startup; repeat calls are no-ops."""
+        if self._model is not None:
+            return
+
+        # int8 weights with fp16 activations on GPU, plain int8 on CPU
+        compute_type = settings.whisper_compute_type or (
+            "int8_float16" if ctranslate2.get_cuda_device_count() > 0 else "int8"
+        )
+        logger.info(
+            "loading_whisper_model",
+            model=settings.whisper_model,
+            compute_type=compute_type,
+        )
+        # The batched pipeline splits audio on VAD boundaries and decodes the
+        # chunks in parallel batches
+        self._model = BatchedInferencePipeline(
+            model=WhisperModel(
+                settings.whisper_model,
+                device="auto",
+                compute_type=compute_type,
+            )
         )
         logger.info("whisper_model_loaded")
 
-    def _get_model(self) -> WhisperModel:
+    def _get_model(self) -> BatchedInferencePipeline:
         """Get model, raising if not loaded."""
         if self._model is None:
             raise RuntimeError("Whisper model not loaded. Call load_models() first.")
@@ -34,21 +51,25 @@ class TranscriptionService:
 
     def transcribe(
         self,
-        audio_path: str,
+        audio: str | np.ndarray,
         language: str | None = None,
     ) -> list[dict]:
         """
-        Transcribe audio file.
+        Transcribe an audio file or 16 kHz mono float32 samples.
 
         Returns list of segments with text, start_time, end_time, confidence.
         """
-        logger.info("transcribing_audio", audio_path=audio_path, language=language)
+        logger.info("transcribing_audio", language=language)
 
         segments_result, info = self._get_model().transcribe(
-            audio_path,
+            audio,
             language=language,
+            batch_size=settings.whisper_batch_size,
             beam_size=5,
             word_timestamps=True,
+            # The batched pipeline defaults to True, which returns each VAD
+            # chunk (up to 30 s) as a single segment
+            without_timestamps=False,
             vad_filter=True,
         )
 
@@ -59,24 +80,24 @@ class TranscriptionService:
             duration=info.duration,
         )
 
-        segments = []
-        for segment in segments_result:
-            segments.append(
-                {
-                    "text": segment.text.strip(),
-                    "start_time": segment.start,
-                    "end_time": segment.end,
-                    "confidence": segment.avg_logprob,
-                    "language": info.language,
-                }
-            )
+        language = info.language
+        segments = [
+            {
+                "text": segment.text.strip(),
+                "start_time": segment.start,
+                "end_time": segment.end,
+                "confidence": segment.avg_logprob,
+                "language": language,
+            }
+            for segment in segments_result
+        ]
 
         logger.info("transcription_complete", segment_count=len(segments))
         return segments
 
     def transcribe_with_words(
         self,
-        audio_path: str,
+        audio: str | np.ndarray,
         language: str | None = None,
     ) -> tuple[list[dict], list[dict]]:
         """
@@ -84,44 +105,42 @@ class TranscriptionService:
 
         Returns tuple of (segments, words).
         """
-        logger.info(
-            "transcribing_with_words",
-            audio_path=audio_path,
-            language=language,
-        )
+        logger.info("transcribing_with_words", language=language)
 
         segments_result, info = self._get_model().transcribe(
-            audio_path,
+            audio,
             language=language,
+            batch_size=settings.whisper_batch_size,
             beam_size=5,
             word_timestamps=True,
+            without_timestamps=False,
             vad_filter=True,
         )
 
-        segments = []
-        words = []
-
-        for segment in segments_result:
-            segments.append(
-                {
-                    "text": segment.text.strip(),
-                    "start_time": segment.start,
-                    "end_time": segment.end,
-                    "confidence": segment.avg_logprob,
-                    "language": info.language,
-                }
-            )
-
-            if segment.words:
-                for word in segment.words:
-                    words.append(
-                        {
-                            "word": word.word,
-                            "start_time": word.start,
-                            "end_time": word.end,
-                            "probability": word.probability,
-                        }
-                    )
+        # Materialize the lazy generator once; both lists are built from it
+        language = info.language
+        segment_list = list(segments_result)
+
+        segments = [
+            {
+                "text": segment.text.strip(),
+                "start_time": segment.start,
+                "end_time": segment.end,
+                "confidence": segment.avg_logprob,
+                "language": language,
+            }
+            for segment in segment_list
+        ]
+        words = [
+            {
+                "word": word.word,
+                "start_time": word.start,
+                "end_time": word.end,
+                "probability": word.probability,
+            }
+            for segment in segment_list
+            for word in segment.words or ()
+        ]
 
         logger.info(
             "word_transcription_complete",
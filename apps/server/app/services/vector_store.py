@@ -1,7 +1,9 @@
 """Vector store service using Qdrant."""
 
+import hashlib
 from uuid import UUID, uuid5, NAMESPACE_DNS
 
+import numpy as np
 from qdrant_client import QdrantClient
 from qdrant_client.http import models
 from qdrant_client.http.models import Distance, VectorParams
@@ -16,6 +18,13 @@ settings = get_settings()
 VISUAL_COLLECTION = "visual_embeddings"
 SPEECH_COLLECTION = "speech_embeddings"
 
+# Payload fields returned with search hits (scene_index is never read back)
+VISUAL_PAYLOAD_FIELDS = ["video_id", "video_filename", "timestamp", "frame_path"]
+SPEECH_PAYLOAD_FIELDS = ["video_id", "video_filename", "start_time", "end_time", "text"]
+
+# Points per upsert request when uploading a video's embeddings
+UPLOAD_BATCH_SIZE = 256
+
 
 def generate_point_id(video_id: UUID, index: int, prefix: str = "") -> str:
     """Generate a deterministic UUID for a point based on video_id and index."""
@@ -24,6 +33,21 @@ def generate_point_id(video_id: UUID, index: int, prefix: str = "") -> str:
     return str(uuid5(NAMESPACE_DNS, name))
 
 
+def generate_point_ids(video_id: UUID, count: int, prefix: str = "") -> list[str]:
+    """Batch generate_point_id for indices 0..count-1, hashing the prefix once."""
+    base = hashlib.sha1(NAMESPACE_DNS.bytes + f"{video_id}_{prefix}_".encode())
+    ids = []
+    for i in range(count):
+        h = base.copy()
+        h.update(str(i).encode())
+        # Set the RFC 4122 version 5 and variant bits, as uuid5 does
+        d = bytearray(h.digest()[:16])
+        d[6] = (d[6] & 0x0F) | 0x50
+        d[8] = (d[8] & 0x3F) | 0x80
+        ids.append(str(UUID(bytes=bytes(d))))
+    return ids
+
+
 class VectorStoreService:
     """Service for managing vector embeddings in Qdrant."""
 
@@ -39,15 +63,57 @@ class VectorStoreService:
                 "connecting_to_qdrant",
                 host=settings.qdrant_host,
                 port=settings.qdrant_port,
+                grpc_port=settings.qdrant_grpc_port,
+                prefer_grpc=settings.qdrant_prefer_grpc,
             )
             self._client = QdrantClient(
                 host=settings.qdrant_host,
                 port=settings.qdrant_port,
+                grpc_port=settings.qdrant_grpc_port,
+                prefer_grpc=settings.qdrant_prefer_grpc,
                 api_key=settings.qdrant_api_key or None,
+                timeout=settings.qdrant_timeout,
             )
             logger.info("qdrant_connected")
         return self._client
 
+    @staticmethod
+    def _hnsw_config() -> models.HnswConfigDiff:
+        """HNSW index parameters used when creating collections."""
+        return models.HnswConfigDiff(
+            m=settings.hnsw_m,
+            ef_construct=settings.hnsw_ef_construction,
+        )
+
+    @staticmethod
+    def _quantization_config() -> models.ScalarQuantization | None:
+        """int8 scalar quantization kept in RAM; full vectors are used to rescore."""
+        if not settings.qdrant_int8_quantization:
+            return None
+        return models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(
+                type=models.ScalarType.INT8,
+                quantile=0.99,
+                always_ram=True,
+            )
+        )
+
+    @staticmethod
+    def _vector_params(size: int) -> VectorParams:
+        """Cosine vectors, stored as float16 to halve vector storage."""
+        return VectorParams(
+            size=size,
+            distance=Distance.COSINE,
+            datatype=(
+                models.Datatype.FLOAT16 if settings.qdrant_float16_vectors else None
+            ),
+        )
+
+    @staticmethod
+    def _search_params(hnsw_ef: int | None) -> models.SearchParams | None:
+        """Per-query search params; None keeps Qdrant's default ef."""
+        return models.SearchParams(hnsw_ef=hnsw_ef) if hnsw_ef else None
+
     def init_collections(self) -> None:
         """Initialize Qdrant collections if they don't exist."""
         collections = self.client.get_collections().collections
@@ -58,10 +124,9 @@ class VectorStoreService:
             logger.info("creating_collection", name=VISUAL_COLLECTION)
             self.client.create_collection(
                 collection_name=VISUAL_COLLECTION,
-                vectors_config=VectorParams(
-                    size=settings.visual_embedding_dim,
-                    distance=Distance.COSINE,
-                ),
+                vectors_config=self._vector_params(settings.visual_embedding_dim),
+                hnsw_config=self._hnsw_config(),
+                quantization_config=self._quantization_config(),
             )
 
         # Create speech embeddings collection
@@ -69,10 +134,9 @@ class VectorStoreService:
             logger.info("creating_collection", name=SPEECH_COLLECTION)
             self.client.create_collection(
                 collection_name=SPEECH_COLLECTION,
-                vectors_config=VectorParams(
-                    size=settings.speech_embedding_dim,
-                    distance=Distance.COSINE,
-                ),
+                vectors_config=self._vector_params(settings.speech_embedding_dim),
+                hnsw_config=self._hnsw_config(),
+                quantization_config=self._quantization_config(),
             )
 
         logger.info("collections_initialized")
@@ -81,13 +145,15 @@ class VectorStoreService:
         self,
         video_id: UUID,
         keyframes: list[dict],
-        embeddings: list[list[float]],
+        embeddings: np.ndarray,
+        filename: str | None = None,
     ) -> None:
         """
         Store visual embeddings for keyframes.
 
         keyframes: list of dicts with frame_path, timestamp
-        embeddings: corresponding embedding vectors
+        embeddings: corresponding float32 array of shape (N, D)
+        filename: video filename stored in the payload so search skips the DB
         """
         logger.info(
             "storing_visual_embeddings",
@@ -95,41 +161,39 @@ class VectorStoreService:
             count=len(embeddings),
         )
 
-        points = []
-        for i, (keyframe, embedding) in enumerate(zip(keyframes, embeddings)):
-            # Generate a valid UUID for the point
-            point_id = generate_point_id(video_id, i, "visual")
-            points.append(
-                models.PointStruct(
-                    id=point_id,
-                    vector=embedding,
-                    payload={
-                        "video_id": str(video_id),
-                        "frame_path": keyframe["frame_path"],
-                        "timestamp": keyframe["timestamp"],
-                        "scene_index": keyframe.get("scene_index", i),
-                    },
-                )
-            )
-
-        self.client.upsert(
-            collection_name=VISUAL_COLLECTION,
-            points=points,
+        video_id_str = str(video_id)
+        count = min(len(keyframes), len(embeddings))
+        self._upload(
+            VISUAL_COLLECTION,
+            vectors=embeddings[:count],
+            ids=generate_point_ids(video_id, count, "visual"),
+            payloads=[
+                {
+                    "video_id": video_id_str,
+                    "video_filename": filename,
+                    "frame_path": keyframe["frame_path"],
+                    "timestamp": keyframe["timestamp"],
+                    "scene_index": keyframe.get("scene_index", i),
+                }
+                for i, keyframe in enumerate(keyframes[:count])
+            ],
         )
 
-        logger.info("visual_embeddings_stored", count=len(points))
+        logger.info("visual_embeddings_stored", count=count)
 
     def store_speech_embeddings(
         self,
         video_id: UUID,
         segments: list[dict],
-        embeddings: list[list[float]],
+        embeddings: np.ndarray,
+        filename: str | None = None,
     ) -> None:
         """
         Store speech embeddings for transcript segments.
 
         segments: list of dicts with text, start_time, end_time
-        embeddings: corresponding embedding vectors
+        embeddings: corresponding float32 array of shape (N, D)
+        filename: video filename stored in the payload so search skips the DB
         """
         logger.info(
             "storing_speech_embeddings",
@@ -137,35 +201,58 @@ class VectorStoreService:
             count=len(embeddings),
         )
 
-        points = []
-        for i, (segment, embedding) in enumerate(zip(segments, embeddings)):
-            # Generate a valid UUID for the point
-            point_id = generate_point_id(video_id, i, "speech")
-            points.append(
-                models.PointStruct(
-                    id=point_id,
-                    vector=embedding,
-                    payload={
-                        "video_id": str(video_id),
-                        "text": segment["text"],
-                        "start_time": segment["start_time"],
-                        "end_time": segment["end_time"],
-                    },
-                )
-            )
-
-        self.client.upsert(
-            collection_name=SPEECH_COLLECTION,
-            points=points,
+        video_id_str = str(video_id)
+        count = min(len(segments), len(embeddings))
+        self._upload(
+            SPEECH_COLLECTION,
+            vectors=embeddings[:count],
+            ids=generate_point_ids(video_id, count, "speech"),
+            payloads=[
+                {
+                    "video_id": video_id_str,
+                    "video_filename": filename,
+                    "text": segment["text"],
+                    "start_time": segment["start_time"],
+                    "end_time": segment["end_time"],
+                }
+                for segment in segments[:count]
+            ],
         )
 
-        logger.info("speech_embeddings_stored", count=len(points))
+        logger.info("speech_embeddings_stored", count=count)
+
+    def _upload(
+        self,
+        collection_name: str,
+        vectors: np.ndarray,
+        ids: list[str],
+        payloads: list[dict],
+    ) -> None:
+        """
+        Bulk-upload points as a vector array plus parallel id/payload lists.
+
+        Only the last batch waits to be applied. Qdrant applies a collection's
+        updates in order, so the points are all searchable on return.
+        """
+        last = max(len(ids) - 1, 0) // UPLOAD_BATCH_SIZE * UPLOAD_BATCH_SIZE
+        for start, stop, wait in ((0, last, False), (last, len(ids), True)):
+            if start == stop:
+                continue
+            self.client.upload_collection(
+                collection_name=collection_name,
+                vectors=vectors[start:stop],
+                ids=ids[start:stop],
+                payload=payloads[start:stop],
+                batch_size=UPLOAD_BATCH_SIZE,
+                wait=wait,
+            )
 
     def search_visual(
         self,
-        query_embedding: list[float],
+        query_embedding: np.ndarray,
         limit: int = 10,
         score_threshold: float = 0.5,
+        hnsw_ef: int | None = None,
     ) -> list[dict]:
         """Search for visually similar frames."""
         results = self.client.query_points(
@@ -173,24 +260,29 @@ class VectorStoreService:
             query=query_embedding,
             limit=limit,
             score_threshold=score_threshold,
+            search_params=self._search_params(hnsw_ef),
+            with_payload=VISUAL_PAYLOAD_FIELDS,
         )
 
         return [
             {
-                "video_id": r.payload["video_id"],
-                "timestamp": r.payload["timestamp"],
-                "frame_path": r.payload["frame_path"],
+                "video_id": payload["video_id"],
+                "video_filename": payload.get("video_filename"),
+                "timestamp": payload["timestamp"],
+                "frame_path": payload["frame_path"],
                 "score": r.score,
                 "type": "visual",
             }
             for r in results.points
+            for payload in (r.payload,)
         ]
 
     def search_speech(
         self,
-        query_embedding: list[float],
+        query_embedding: np.ndarray,
         limit: int = 10,
         score_threshold: float = 0.5,
+        hnsw_ef: int | None = None,
     ) -> list[dict]:
         """Search for semantically similar speech segments."""
         results = self.client.query_points(
@@ -198,18 +290,22 @@ class VectorStoreService:
             query=query_embedding,
             limit=limit,
             score_threshold=score_threshold,
+            search_params=self._search_params(hnsw_ef),
+            with_payload=SPEECH_PAYLOAD_FIELDS,
         )
 
         return [
             {
-                "video_id": r.payload["video_id"],
-                "timestamp": r.payload["start_time"],
-                "end_timestamp": r.payload["end_time"],
-                "text": r.payload["text"],
+                "video_id": payload["video_id"],
+                "video_filename": payload.get("video_filename"),
+                "timestamp": payload["start_time"],
+                "end_timestamp": payload["end_time"],
+                "text": payload["text"],
                 "score": r.score,
                 "type": "speech",
             }
             for r in results.points
+            for payload in (r.payload,)
         ]
 
     def delete_video_embeddings(self, video_id: UUID) -> None:
@@ -1,12 +1,21 @@
 """Video processing service for scene detection and keyframe extraction."""
 
+import asyncio
+import hashlib
+import os
+import re
 import subprocess
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from uuid import UUID
-import json
 
-from scenedetect import detect, ContentDetector, AdaptiveDetector
-from scenedetect.scene_manager import save_images
+import numpy as np
+import orjson
+from PIL import Image
+from scenedetect import detect, AdaptiveDetector
 
 from app.core.config import get_settings
 from app.core.logging import get_logger
@@ -14,6 +23,48 @@ from app.core.logging import get_logger
 logger = get_logger(__name__)
 settings = get_settings()
 
+# Max ffprobe results cached in memory; all are also persisted as JSON under
+# cache_dir/PROBE_DIR, keyed by a hash of (path, size, mtime_ns)
+PROBE_CACHE_SIZE = 128
+PROBE_DIR = "probe"
+
+# Thumbnail offset (seconds) when the video duration isn't known
+THUMBNAIL_DEFAULT_TIME = 3.0
+
+# Frame timestamps printed by ffmpeg's showinfo filter
+SHOWINFO_PTS_TIME = re.compile(rb"pts_time:\s*([0-9.]+)")
+
+# Mid-scene frames whose dHash is within this many bits of the scene's
+# start frame are treated as duplicates
+DHASH_WIDTH = 8
+DHASH_HEIGHT = 8
+DHASH_MIN_DISTANCE = 8
+
+# Keyframes feed the embedder, which resizes to its input size anyway: shrink
+# the shorter side to keyframe_min_side (never upscaling), keeping the aspect
+# ratio with even dimensions
+KEYFRAME_SCALE = (
+    f"scale='if(gt(iw,ih),-2,min(iw,{settings.keyframe_min_side}))'"
+    f":'if(gt(iw,ih),min(ih,{settings.keyframe_min_side}),-2)'"
+)
+
+# JPEG start/end-of-image markers delimiting frames in an MJPEG stream
+JPEG_SOI = b"\xff\xd8"
+JPEG_EOI = b"\xff\xd9"
+
+# Directories this process has already created, see _ensure_dir()
+_created_dirs: set[Path] = set()
+_created_dirs_lock = threading.Lock()
+
+
+def _ensure_dir(path: Path) -> None:
+    """mkdir -p, skipping the syscall for directories created earlier."""
+    if path in _created_dirs:
+        return
+    path.mkdir(parents=True, exist_ok=True)
+    with _created_dirs_lock:
+        _created_dirs.add(path)
+
 
 class VideoProcessorService:
     """Service for processing videos and extracting keyframes."""
@@ -21,16 +72,90 @@ class VideoProcessorService:
     def __init__(self) -> None:
         """Initialize video processor."""
         self.frames_dir = settings.frames_dir
+        # Kept outside frames_dir, which is served publicly
+        self.probe_dir = settings.cache_dir / PROBE_DIR
+        # ffprobe results keyed by (path, size, mtime_ns), shared by the sync
+        # (worker thread) and async (request handler) probes
+        self._probe_cache: OrderedDict[tuple[str, int, int], dict] = OrderedDict()
+        self._probe_lock = threading.Lock()
 
     def get_video_info(self, video_path: str) -> dict:
         """
         Extract video metadata using ffprobe.
 
-        Returns dict with duration, width, height, fps.
+        Returns dict with duration, width, height, fps. Results are cached per
+        file version, so repeated calls on an unchanged file don't re-probe.
         """
-        logger.info("extracting_video_info", video_path=video_path)
+        key = self._probe_key(video_path)
+        info = self._cached_probe(key)
+        if info is None:
+            result = subprocess.run(self._probe_cmd(video_path), capture_output=True)
+            info = self._parse_probe(key, result.returncode, result.stdout)
+        return dict(info)
+
+    async def get_video_info_async(self, video_path: str) -> dict:
+        """Like get_video_info, without blocking a thread on ffprobe."""
+        key = self._probe_key(video_path)
+        info = self._cached_probe(key)
+        if info is None:
+            proc = await asyncio.create_subprocess_exec(
+                *self._probe_cmd(video_path),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            try:
+                stdout, _ = await proc.communicate()
+            except asyncio.CancelledError:
+                proc.kill()
+                raise
+            info = self._parse_probe(key, proc.returncode, stdout)
+        return dict(info)
+
+    @staticmethod
+    def _probe_key(video_path: str) -> tuple[str, int, int]:
+        # size and mtime invalidate the cached probe when the file changes
+        stat = os.stat(video_path)
+        return video_path, stat.st_size, stat.st_mtime_ns
+
+    def _cached_probe(self, key: tuple[str, int, int]) -> dict | None:
+        with self._probe_lock:
+            info = self._probe_cache.get(key)
+            if info is not None:
+                self._probe_cache.move_to_end(key)
+                return info
+
+        # Fall back to the on-disk copy, which survives restarts
+        try:
+            info = orjson.loads(self._probe_file(key).read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+        self._remember_probe(key, info)
+        return info
 
-        cmd = [
+    def _remember_probe(self, key: tuple[str, int, int], info: dict) -> None:
+        with self._probe_lock:
+            self._probe_cache[key] = info
+            if len(self._probe_cache) > PROBE_CACHE_SIZE:
+                self._probe_cache.popitem(last=False)
+
+    def _probe_file(self, key: tuple[str, int, int]) -> Path:
+        digest = hashlib.sha1("{}:{}:{}".format(*key).encode()).hexdigest()
+        return self.probe_dir / f"{digest}.json"
+
+    def forget_probe(self, video_path: str) -> None:
+        """Drop the cached probe of a video; call before deleting the file."""
+        try:
+            key = self._probe_key(video_path)
+        except OSError:
+            return
+
+        with self._probe_lock:
+            self._probe_cache.pop(key, None)
+        self._probe_file(key).unlink(missing_ok=True)
+
+    @staticmethod
+    def _probe_cmd(video_path: str) -> list[str]:
+        return [
             "ffprobe",
             "-v",
             "quiet",
@@ -41,49 +166,79 @@ class VideoProcessorService:
             video_path,
         ]
 
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-
-            data = json.loads(result.stdout)
+    def _parse_probe(
+        self, key: tuple[str, int, int], returncode: int, stdout: bytes
+    ) -> dict:
+        """Parse (and cache) ffprobe JSON output for the file version in key."""
+        logger.info("extracting_video_info", video_path=key[0])
 
-            # Find video stream
-            video_stream = next(
-                (s for s in data.get("streams", []) if s["codec_type"] == "video"), None
+        if returncode != 0:
+            logger.error("ffprobe_failed", returncode=returncode)
+            raise RuntimeError(
+                f"Failed to get video info: ffprobe exited with {returncode}"
             )
 
-            info = {
-                "duration": float(data.get("format", {}).get("duration", 0)),
-                "file_size": int(data.get("format", {}).get("size", 0)),
-            }
+        # orjson parses the raw bytes; no text decode round-trip
+        data = orjson.loads(stdout)
 
-            if video_stream:
-                info["width"] = video_stream.get("width")
-                info["height"] = video_stream.get("height")
-
-                # Parse fps from frame rate string like "30/1"
-                fps_str = video_stream.get("r_frame_rate", "0/1")
-                if "/" in fps_str:
-                    num, den = map(int, fps_str.split("/"))
-                    info["fps"] = num / den if den else 0
-                else:
-                    info["fps"] = float(fps_str)
-
-            logger.info("video_info_extracted", **info)
-            return info
+        # Find video stream
+        video_stream = next(
+            (s for s in data.get("streams", []) if s["codec_type"] == "video"), None
+        )
 
-        except subprocess.CalledProcessError as e:
-            logger.error("ffprobe_failed", error=str(e))
-            raise RuntimeError(f"Failed to get video info: {e}")
+        info = {
+            "duration": float(data.get("format", {}).get("duration", 0)),
+            "file_size": int(data.get("format", {}).get("size", 0)),
+        }
+
+        if video_stream:
+            info["width"] = video_stream.get("width")
+            info["height"] = video_stream.get("height")
+            # Container header value; missing for some formats (e.g. MKV)
+            info["frame_count"] = int(video_stream.get("nb_frames", 0))
+            # Timestamp of the first frame; nonzero e.g. for MPEG-TS or MP4 edits
+            info["start_time"] = float(video_stream.get("start_time", 0))
+
+            # Parse fps from frame rate string like "30/1"
+            fps_str = video_stream.get("r_frame_rate", "0/1")
+            if "/" in fps_str:
+                num, den = map(int, fps_str.split("/"))
+                info["fps"] = num / den if den else 0
+            else:
+                info["fps"] = float(fps_str)
+
+        logger.info("video_info_extracted", **info)
+
+        self._remember_probe(key, info)
+
+        # Write via a temp file and atomic rename so readers never see a
+        # partial file
+        probe_file = self._probe_file(key)
+        try:
+            _ensure_dir(probe_file.parent)
+            tmp_file = probe_file.with_suffix(
+                f".{os.getpid()}.{threading.get_ident()}.tmp"
+            )
+            tmp_file.write_bytes(orjson.dumps(info))
+            os.replace(tmp_file, probe_file)
+        except OSError as e:
+            logger.warning("probe_cache_write_failed", error=str(e))
+        return info
 
-    def extract_thumbnail(
+    async def extract_thumbnail(
         self,
         video_path: str,
         video_id: UUID,
-        duration: float,
+        duration: float | None = None,
         time_percent: float = 0.1,
         width: int = 640,
     ) -> str | None:
-        """Extract a thumbnail at a percentage of video duration."""
+        """
+        Extract a thumbnail at a percentage of video duration.
+
+        Without a known duration the video isn't probed just for this; the
+        frame is taken at a fixed offset instead.
+        """
         logger.info(
             "extracting_thumbnail",
             video_path=video_path,
@@ -93,20 +248,29 @@ class VideoProcessorService:
 
         try:
             # Calculate timestamp (default to 10% into the video, min 0.5s, max 30s)
-            timestamp = max(0.5, min(duration * time_percent, 30.0))
+            if duration is None:
+                timestamp = THUMBNAIL_DEFAULT_TIME
+            else:
+                timestamp = max(0.5, min(duration * time_percent, 30.0))
 
             # Create output directory
             output_dir = self.frames_dir / str(video_id)
-            output_dir.mkdir(parents=True, exist_ok=True)
+            _ensure_dir(output_dir)
 
             thumbnail_path = output_dir / "thumbnail.jpg"
 
             cmd = [
                 "ffmpeg",
+                # Input seek to the nearest keyframe; a thumbnail needn't be exact
+                "-noaccurate_seek",
                 "-ss",
                 str(timestamp),
                 "-i",
                 video_path,
+                # Video only: skip audio, subtitle and data streams
+                "-an",
+                "-sn",
+                "-dn",
                 "-vframes",
                 "1",
                 "-vf",
@@ -117,18 +281,38 @@ class VideoProcessorService:
                 str(thumbnail_path),
             ]
 
-            subprocess.run(cmd, capture_output=True, check=True)
+            # Run ffmpeg on the event loop rather than in a thread-pool slot
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                _, stderr = await proc.communicate()
+            except asyncio.CancelledError:
+                proc.kill()
+                raise
+
+            if proc.returncode != 0:
+                logger.warning(
+                    "thumbnail_extraction_failed",
+                    video_id=str(video_id),
+                    error=stderr.decode(errors="replace"),
+                )
+                return None
+
+            # ffmpeg exits cleanly without output when seeking past the end
+            if not thumbnail_path.exists():
+                logger.warning(
+                    "thumbnail_extraction_failed",
+                    video_id=str(video_id),
+                    error=f"no frame at {timestamp}s",
+                )
+                return None
 
             logger.info("thumbnail_extracted", path=str(thumbnail_path))
             return str(thumbnail_path)
 
-        except subprocess.CalledProcessError as e:
-            logger.warning(
-                "thumbnail_extraction_failed",
-                video_id=str(video_id),
-                error=e.stderr.decode() if e.stderr else str(e),
-            )
-            return None
         except Exception as e:
             logger.warning(
                 "thumbnail_extraction_error",
@@ -147,15 +331,127 @@ class VideoProcessorService:
 
         Returns list of dicts with frame_path and timestamp.
         """
+        video_id_str = str(video_id)
         logger.info(
             "extracting_keyframes",
             video_path=video_path,
-            video_id=str(video_id),
+            video_id=video_id_str,
         )
 
         # Create output directory for this video
-        output_dir = self.frames_dir / str(video_id)
-        output_dir.mkdir(parents=True, exist_ok=True)
+        output_dir = self.frames_dir / video_id_str
+        _ensure_dir(output_dir)
+        # Frame paths are plain strings: ffmpeg, PIL and the payloads take them
+        output_dir_str = str(output_dir)
+
+        scenes = self._detect_scenes(video_path)
+
+        logger.info("scenes_detected", count=len(scenes))
+
+        # Keyframe at the start of each scene, plus the middle of longer ones,
+        # as (scene_index, frame_number, timestamp) in frame order
+        targets = []
+        for i, (start_frame, start_time, end_frame, end_time) in enumerate(scenes):
+            targets.append((i, start_frame, start_time))
+
+            duration = end_time - start_time
+            if duration > 2.0:
+                mid_frame = start_frame + (end_frame - start_frame) // 2
+                targets.append((i, mid_frame, start_time + duration / 2))
+
+        # Decode the video once and write frames as they stream out of ffmpeg
+        frame_paths = [
+            f"{output_dir_str}/frame_{i:04d}_{ts:.2f}.jpg" for i, _, ts in targets
+        ]
+        written = 0
+        # The generator goes first so zip() runs it to completion
+        for jpeg, frame_path in zip(
+            self._extract_frames_batch(video_path, [n for _, n, _ in targets]),
+            frame_paths,
+        ):
+            with open(frame_path, "wb") as f:
+                f.write(jpeg)
+            written += 1
+
+        # Seek individually for anything the single pass didn't produce; each
+        # ffmpeg seek+decode is mostly single-threaded, so run them in parallel
+        extracted = [True] * written
+        if written < len(targets):
+            with ThreadPoolExecutor(max_workers=min(16, os.cpu_count() or 1)) as pool:
+                extracted += pool.map(
+                    lambda target, frame_path: self._extract_frame(
+                        video_path, target[2], frame_path
+                    ),
+                    targets[written:],
+                    frame_paths[written:],
+                )
+
+        keyframes = []
+        scene_starts: dict[int, str] = {}
+        skipped = 0
+        for (i, _, ts), frame_path, ok in zip(targets, frame_paths, extracted):
+            if not ok:
+                continue
+
+            # Drop mid-scene frames that look like the scene's start frame
+            # (static shots); they would only add redundant embeddings
+            start_path = scene_starts.setdefault(i, frame_path)
+            if start_path != frame_path and self._is_near_duplicate(
+                start_path, frame_path
+            ):
+                os.remove(frame_path)
+                skipped += 1
+                continue
+
+            keyframes.append(
+                {
+                    "frame_path": frame_path,
+                    "timestamp": ts,
+                    "scene_index": i,
+                }
+            )
+
+        logger.info(
+            "keyframes_extracted", count=len(keyframes), duplicates_skipped=skipped
+        )
+        return keyframes
+
+    @staticmethod
+    def _dhash(image_path: str) -> int:
+        """64-bit difference hash of a frame (9x8 grayscale, adjacent pixels)."""
+        with Image.open(image_path) as image:
+            # Let libjpeg decode at 1/8 scale instead of full resolution
+            image.draft("L", (DHASH_WIDTH + 1, DHASH_HEIGHT))
+            pixels = np.asarray(
+                image.convert("L").resize(
+                    (DHASH_WIDTH + 1, DHASH_HEIGHT), Image.Resampling.BILINEAR
+                ),
+                dtype=np.int16,
+            )
+        bits = pixels[:, 1:] > pixels[:, :-1]
+        return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+    def _is_near_duplicate(self, first: str, second: str) -> bool:
+        """Whether two frames' dHashes differ in fewer than DHASH_MIN_DISTANCE bits."""
+        try:
+            distance = (self._dhash(first) ^ self._dhash(second)).bit_count()
+        except OSError as e:
+            logger.warning("frame_hash_failed", error=str(e))
+            return False
+        return distance < DHASH_MIN_DISTANCE
+
+    def _detect_scenes(self, video_path: str) -> list[tuple[int, float, int, float]]:
+        """
+        Detect scenes as (start_frame, start_seconds, end_frame, end_seconds).
+
+        Uses ffmpeg's scene filter when enabled, falling back to PySceneDetect.
+        Like PySceneDetect, a video without cuts yields no scenes.
+        """
+        if settings.ffmpeg_scene_detection:
+            try:
+                return self._detect_scenes_ffmpeg(video_path)
+            except (subprocess.CalledProcessError, RuntimeError, OSError) as e:
+                logger.warning("ffmpeg_scene_detection_failed", error=str(e))
 
         # Detect scenes using content detector
         scenes = detect(
@@ -163,40 +459,139 @@ class VideoProcessorService:
             AdaptiveDetector(),
             show_progress=False,
         )
+        return [
+            (
+                start_time.get_frames(),
+                start_time.get_seconds(),
+                end_time.get_frames(),
+                end_time.get_seconds(),
+            )
+            for start_time, end_time in scenes
+        ]
 
-        logger.info("scenes_detected", count=len(scenes))
+    def _detect_scenes_ffmpeg(
+        self, video_path: str
+    ) -> list[tuple[int, float, int, float]]:
+        """Detect scene cuts with ffmpeg's scene filter, parsing showinfo output."""
+        info = self.get_video_info(video_path)
+        fps = info.get("fps")
+        if not fps:
+            raise RuntimeError("Video has no frame rate")
+
+        cmd = ["ffmpeg", "-hide_banner", "-nostats"]
+        if settings.scene_detection_hwaccel:
+            cmd += ["-hwaccel", settings.scene_detection_hwaccel]
+        # -copyts keeps the stream's own timestamps, so pts_time minus the
+        # probed start_time is exact whatever the other streams start at
+        cmd += [
+            "-copyts",
+            "-i",
+            video_path,
+            "-an",
+            "-sn",
+            "-dn",
+            "-vf",
+            f"select='gt(scene,{settings.scene_threshold})',showinfo",
+            "-f",
+            "null",
+            "-",
+        ]
+        result = subprocess.run(cmd, capture_output=True, check=True)
+
+        # Frame indices count from the first decoded frame, which the later
+        # select='eq(n,...)' extraction relies on
+        start_time = info.get("start_time", 0)
+        cut_frames = [
+            round((float(match) - start_time) * fps)
+            for match in SHOWINFO_PTS_TIME.findall(result.stderr)
+        ]
+        if not cut_frames:
+            return []
+
+        end_frame = self.count_frames(video_path) or round(info["duration"] * fps)
+        boundaries = sorted({0, *cut_frames, end_frame})
+        return [
+            (start, start / fps, end, end / fps)
+            for start, end in zip(boundaries, boundaries[1:])
+        ]
 
-        # Extract keyframes from each scene
-        keyframes = []
+    def _extract_frames_batch(
+        self,
+        video_path: str,
+        frame_numbers: list[int],
+    ) -> Iterator[bytes]:
+        """
+        Extract frames by index in one ffmpeg pass, yielding JPEGs in frame order.
 
-        for i, (start_time, end_time) in enumerate(scenes):
-            # Get frame at start and middle of scene
-            timestamps = [start_time.get_seconds()]
+        frame_numbers must be strictly increasing. Frames past the end of the
+        video (or after an ffmpeg error) are simply not yielded.
+        """
+        if not frame_numbers:
+            return
 
-            # Add middle frame for longer scenes
-            duration = end_time.get_seconds() - start_time.get_seconds()
-            if duration > 2.0:
-                mid_time = start_time.get_seconds() + duration / 2
-                timestamps.append(mid_time)
-
-            for ts in timestamps:
-                frame_filename = f"frame_{i:04d}_{ts:.2f}.jpg"
-                frame_path = output_dir / frame_filename
-
-                # Extract frame using ffmpeg
-                success = self._extract_frame(video_path, ts, str(frame_path))
-
-                if success:
-                    keyframes.append(
-                        {
-                            "frame_path": str(frame_path),
-                            "timestamp": ts,
-                            "scene_index": i,
-                        }
-                    )
-
-        logger.info("keyframes_extracted", count=len(keyframes))
-        return keyframes
+        select = "+".join(f"eq(n,{n})" for n in frame_numbers)
+        cmd = [
+            "ffmpeg",
+            "-loglevel",
+            "error",
+            "-i",
+            video_path,
+            "-an",
+            "-sn",
+            "-dn",
+            "-vf",
+            f"select='{select}',{KEYFRAME_SCALE}",
+            "-fps_mode",
+            "vfr",
+            "-q:v",
+            "2",
+            "-f",
+            "image2pipe",
+            "-vcodec",
+            "mjpeg",
+            "pipe:1",
+        ]
+
+        # stderr isn't piped: a corrupt video can log more than the pipe holds
+        # while stdout is being drained
+        with subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        ) as process:
+            drained = False
+            try:
+                # ffmpeg's MJPEG output has no embedded thumbnails and byte-stuffs
+                # 0xFF in entropy-coded data, so EOI markers only end whole frames
+                buffer = bytearray()
+                search_from = 0
+                remaining = len(frame_numbers)
+                while chunk := process.stdout.read1(1 << 20):
+                    buffer += chunk
+                    while (end := buffer.find(JPEG_EOI, search_from)) != -1:
+                        jpeg = bytes(buffer[buffer.find(JPEG_SOI) : end + 2])
+                        del buffer[: end + 2]
+                        search_from = 0
+                        remaining -= 1
+                        if not remaining:
+                            # Don't decode the rest of the video for nothing;
+                            # killed before the last yield, since the consumer
+                            # may never resume the generator after it
+                            process.kill()
+                            yield jpeg
+                            return
+                        yield jpeg
+                    search_from = max(len(buffer) - 1, 0)
+                drained = True
+            finally:
+                # An early close() mustn't leave Popen.__exit__ waiting on ffmpeg
+                if not drained and process.poll() is None:
+                    process.kill()
+
+        if process.returncode != 0:
+            logger.warning(
+                "batch_frame_extraction_failed",
+                returncode=process.returncode,
+                missing=remaining,
+            )
 
     def _extract_frame(
         self,
@@ -204,28 +599,36 @@ class VideoProcessorService:
         timestamp: float,
         output_path: str,
     ) -> bool:
-        """Extract a single frame at the given timestamp."""
+        """Extract a single frame at the given timestamp; False if none was written."""
         cmd = [
             "ffmpeg",
             "-ss",
             str(timestamp),
             "-i",
             video_path,
+            "-an",
+            "-sn",
+            "-dn",
             "-vframes",
             "1",
+            "-vf",
+            KEYFRAME_SCALE,
             "-q:v",
             "2",
             "-y",
             output_path,
         ]
 
+        # ffmpeg exits 0 without writing anything when seeking past the end,
+        # so check for the file, removing any stale one from an earlier run
+        output_file = Path(output_path)
+        output_file.unlink(missing_ok=True)
         try:
             subprocess.run(
                 cmd,
                 capture_output=True,
                 check=True,
             )
-            return True
         except subprocess.CalledProcessError as e:
             logger.warning(
                 "frame_extraction_failed",
@@ -234,8 +637,29 @@ class VideoProcessorService:
             )
             return False
 
+        if not output_file.is_file() or output_file.stat().st_size == 0:
+            logger.warning("frame_extraction_empty", timestamp=timestamp)
+            return False
+        return True
+
     def count_frames(self, video_path: str) -> int:
-        """Count total frames in video."""
+        """
+        Count total frames in video.
+
+        Uses the (cached) stream metadata, falling back to decoding every
+        frame with ffprobe only when the container doesn't report it.
+        """
+        try:
+            info = self.get_video_info(video_path)
+        except (OSError, RuntimeError):
+            info = {}
+
+        frame_count = info.get("frame_count") or round(
+            info.get("duration", 0) * (info.get("fps") or 0)
+        )
+        if frame_count:
+            return frame_count
+
         cmd = [
             "ffprobe",
             "-v",
@@ -0,0 +1,80 @@
+"""Live video processing status using Redis."""
+
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.models import VideoStatus
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# Key prefix for per-video live status
+KEY_PREFIX = "video_status:"
+
+
+class VideoStatusService:
+    """
+    Service for tracking in-flight processing phases outside Postgres.
+
+    Only terminal states (COMPLETED, FAILED) are committed to the database;
+    intermediate phases live here and are overlaid on read.
+    """
+
+    def __init__(self) -> None:
+        """Initialize video status store."""
+        self._client: Redis | None = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether a Redis URL is configured."""
+        return bool(settings.redis_url)
+
+    @property
+    def client(self) -> Redis:
+        """Lazy load Redis client."""
+        if self._client is None:
+            self._client = Redis.from_url(settings.redis_url)
+        return self._client
+
+    async def set(self, video_id: UUID, status: VideoStatus) -> None:
+        """Record the current processing phase for a video."""
+        try:
+            await self.client.setex(
+                f"{KEY_PREFIX}{video_id}", settings.worker_job_timeout, status.value
+            )
+        except RedisError as e:
+            logger.warning("video_status_set_failed", error=str(e))
+
+    async def get_many(self, video_ids: list[UUID]) -> dict[UUID, VideoStatus]:
+        """Return live phases for the given videos (missing ids are omitted)."""
+        if not self.enabled or not video_ids:
+            return {}
+
+        try:
+            values = await self.client.mget([f"{KEY_PREFIX}{v}" for v in video_ids])
+        except RedisError as e:
+            logger.warning("video_status_get_failed", error=str(e))
+            return {}
+
+        return {
+            video_id: VideoStatus(value.decode())
+            for video_id, value in zip(video_ids, values)
+            if value is not None
+        }
+
+    async def clear(self, video_id: UUID) -> None:
+        """Drop the live phase once the terminal state is in the database."""
+        try:
+            await self.client.delete(f"{KEY_PREFIX}{video_id}")
+        except RedisError as e:
+            logger.warning("video_status_clear_failed", error=str(e))
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -1,7 +1,11 @@
 """Utility functions."""
 
-from .time import utc_now
-from .scoring import rescale_siglip_score
+from .time import utc_now, pinned_utc_now
+from .scoring import rescale_siglip_scores
 
 
-__all__ = ["utc_now", "rescale_siglip_score"]
+__all__ = [
+    "utc_now",
+    "pinned_utc_now",
+    "rescale_siglip_scores",
+]
@@ -7,20 +7,18 @@ A "good match" is typically 0.15-0.35 cosine similarity.
 Reference: https://github.com/mlfoundations/open_clip/issues/716
 """
 
-import math
+import numpy as np
 
+# Sigmoid centre and slope of the rescaling curve
+MIDPOINT = 0.18
+STEEPNESS = 12
 
-def rescale_siglip_score(cosine_score: float) -> float:
+
+def rescale_siglip_scores(cosine_scores: np.ndarray | list[float]) -> np.ndarray:
     """
-    Rescale SigLIP cosine similarity to intuitive 0-1 range.
+    Rescale SigLIP cosine similarities to an intuitive 0-1 range.
 
     Maps: 0.35 → ~90%, 0.25 → ~70%, 0.18 → ~50%, 0.10 → ~25%
     """
-    midpoint = 0.18
-    steepness = 12
-
-    x = (cosine_score - midpoint) * steepness
-    rescaled = 1 / (1 + math.exp(-x))
-
-    # Clamp to valid range
-    return max(0.0, min(1.0, rescaled))
+    x = (np.asarray(cosine_scores, dtype=np.float64) - MIDPOINT) * STEEPNESS
+    return np.clip(1 / (1 + np.exp(-x)), 0.0, 1.0)
@@ -1,6 +1,23 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timezone
 
+# Timestamp returned by utc_now() inside a pinned_utc_now() block
+_pinned_now: ContextVar[datetime | None] = ContextVar("pinned_now", default=None)
+
 
 def utc_now() -> datetime:
     """Return current UTC time as timezone-aware datetime."""
-    return datetime.now(timezone.utc)
+    return _pinned_now.get() or datetime.now(timezone.utc)
+
+
+@contextmanager
+def pinned_utc_now() -> Iterator[datetime]:
+    """Make every utc_now() call in the block return the same timestamp."""
+    now = utc_now()
+    token = _pinned_now.set(now)
+    try:
+        yield now
+    finally:
+        _pinned_now.reset(token)
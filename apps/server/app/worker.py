@@ -0,0 +1,244 @@
+"""Background worker for video processing.
+
+Jobs are queued in Redis and executed by arq. Run with:
+
+    uv run arq app.worker.WorkerSettings
+"""
+
+import asyncio
+from uuid import UUID
+
+import numpy as np
+from arq.connections import RedisSettings
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import insert
+
+from app.core.config import get_settings
+from app.core.database import async_session_factory
+from app.core.dependencies import (
+    get_video_processor,
+    get_audio_extractor,
+    get_transcription_service,
+    get_embedding_service,
+    get_vector_store,
+    get_search_cache,
+    get_video_status,
+)
+from app.core.logging import setup_logging, get_logger
+from app.models import Video, VideoStatus, Transcript
+from app.services import (
+    VideoProcessorService,
+    AudioExtractorService,
+    TranscriptionService,
+    EmbeddingService,
+    VectorStoreService,
+    SearchCacheService,
+    VideoStatusService,
+)
+from app.utils import utc_now
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+async def process_video_task(
+    video_id: UUID,
+    video_path: str,
+    video_processor: VideoProcessorService,
+    audio_extractor: AudioExtractorService,
+    transcription: TranscriptionService,
+    embedding: EmbeddingService,
+    vector_store: VectorStoreService,
+    search_cache: SearchCacheService,
+    video_status: VideoStatusService,
+) -> None:
+    """Background task to process a video."""
+
+    async with async_session_factory() as session:
+        try:
+            video = await session.get(Video, video_id)
+
+            if not video:
+                logger.error("video_not_found", video_id=str(video_id))
+                return
+
+            # End the read transaction; nothing is written until the video finishes
+            await session.commit()
+
+            async def set_phase(status: VideoStatus) -> None:
+                # Intermediate phases go to Redis when available, else Postgres
+                if video_status.enabled:
+                    await video_status.set(video_id, status)
+                else:
+                    await Video.set_status(session, video_id, status)
+                    await session.commit()
+
+            # Step 1: Extract keyframes and audio concurrently (separate ffmpeg runs)
+            await set_phase(VideoStatus.EXTRACTING_FRAMES)
+
+            async def extract_audio() -> np.ndarray | None:
+                if not await audio_extractor.has_audio(video_path):
+                    return None
+                return await audio_extractor.extract_audio(video_path, video_id)
+
+            keyframes, frame_count, audio = await asyncio.gather(
+                asyncio.to_thread(
+                    video_processor.extract_keyframes, video_path, video_id
+                ),
+                asyncio.to_thread(video_processor.count_frames, video_path),
+                extract_audio(),
+            )
+            video.keyframe_count = len(keyframes)
+            video.frame_count = frame_count
+
+            # Step 2: Transcribe
+            segments = []
+
+            if audio is not None and audio.size:
+                await set_phase(VideoStatus.TRANSCRIBING)
+
+                segments = await asyncio.to_thread(transcription.transcribe, audio)
+
+            # Step 3: Generate embeddings
+            await set_phase(VideoStatus.EMBEDDING)
+
+            # Visual embeddings
+            if keyframes:
+                frame_paths = [kf["frame_path"] for kf in keyframes]
+                visual_embeddings, kept = await asyncio.to_thread(
+                    embedding.embed_images_batch, frame_paths
+                )
+                # Frames that failed to load have no row; keep the rest aligned
+                await asyncio.to_thread(
+                    vector_store.store_visual_embeddings,
+                    video_id,
+                    [keyframes[i] for i in kept],
+                    visual_embeddings,
+                    video.filename,
+                )
+
+            # Speech embeddings
+            if segments:
+                texts = [seg["text"] for seg in segments]
+                speech_embeddings = await asyncio.to_thread(
+                    embedding.embed_texts_batch, texts
+                )
+                await asyncio.to_thread(
+                    vector_store.store_speech_embeddings,
+                    video_id,
+                    segments,
+                    speech_embeddings,
+                    video.filename,
+                )
+
+            # New embeddings can change results of cached queries
+            await search_cache.invalidate()
+
+            # Save transcripts in a single bulk INSERT only now, so the write
+            # transaction (and its lock on the video row) stays short
+            if segments:
+                created_at = utc_now()
+                await session.execute(
+                    insert(Transcript),
+                    [
+                        {
+                            "video_id": video_id,
+                            "text": seg["text"],
+                            "start_time": seg["start_time"],
+                            "end_time": seg["end_time"],
+                            "confidence": seg.get("confidence"),
+                            "language": seg.get("language"),
+                            "created_at": created_at,
+                        }
+                        for seg in segments
+                    ],
+                )
+
+            # Mark completed (commits counts, transcripts and status together)
+            video.mark_completed()
+            await session.commit()
+            if video_status.enabled:
+                await video_status.clear(video_id)
+
+            logger.info(
+                "video_processing_complete",
+                video_id=str(video_id),
+                keyframes=len(keyframes),
+                segments=len(segments),
+            )
+
+        except asyncio.CancelledError:
+            # arq's job_timeout and worker shutdown cancel the job; record the
+            # failure shielded from the cancellation, then let it propagate
+            logger.warning("video_processing_cancelled", video_id=str(video_id))
+            await asyncio.shield(
+                _mark_failed(
+                    session, video_id, "Processing was cancelled", video_status
+                )
+            )
+            raise
+
+        except Exception as e:
+            logger.exception("video_processing_failed", video_id=str(video_id))
+            await _mark_failed(session, video_id, str(e), video_status)
+
+
+async def _mark_failed(
+    session: AsyncSession,
+    video_id: UUID,
+    error_message: str,
+    video_status: VideoStatusService,
+) -> None:
+    """Discard partial writes, then record the failure without a loaded `video`."""
+    await session.rollback()
+    await Video.set_status(
+        session, video_id, VideoStatus.FAILED, error_message=error_message
+    )
+    await session.commit()
+    if video_status.enabled:
+        await video_status.clear(video_id)
+
+
+async def process_video(ctx: dict, video_id: str, video_path: str) -> None:
+    """arq job wrapping process_video_task with the shared service singletons."""
+    await process_video_task(
+        video_id=UUID(video_id),
+        video_path=video_path,
+        video_processor=get_video_processor(),
+        audio_extractor=get_audio_extractor(),
+        transcription=get_transcription_service(),
+        embedding=get_embedding_service(),
+        vector_store=get_vector_store(),
+        search_cache=get_search_cache(),
+        video_status=get_video_status(),
+    )
+
+
+async def startup(ctx: dict) -> None:
+    """Preload ML models once per worker process."""
+    setup_logging()
+    logger.info("worker_starting")
+    get_vector_store().init_collections()
+    get_embedding_service().load_models()
+    get_transcription_service().load_models()
+    logger.info("worker_started")
+
+
+async def shutdown(ctx: dict) -> None:
+    """Release connections held by the worker."""
+    await get_search_cache().close()
+    await get_video_status().close()
+    logger.info("worker_stopped")
+
+
+class WorkerSettings:
+    """arq worker configuration."""
+
+    functions = [process_video]
+    on_startup = startup
+    on_shutdown = shutdown
+    redis_settings = RedisSettings.from_dsn(
+        settings.redis_url or "redis://localhost:6379"
+    )
+    max_jobs = settings.worker_max_jobs
+    job_timeout = settings.worker_job_timeout
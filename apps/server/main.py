@@ -10,10 +10,13 @@ from app.api import api_router
 from app.core.config import get_settings
 from app.core.database import init_db, check_db_connection
 from app.core.logging import setup_logging, get_logger
+from app.core.queue import close_job_queue
 from app.core.dependencies import (
     get_vector_store,
     get_embedding_service,
     get_transcription_service,
+    get_search_cache,
+    get_video_status,
 )
 
 settings = get_settings()
@@ -36,8 +39,11 @@ async def lifespan(app: FastAPI):
 
     # Preload ML models
     logger.info("preloading_ml_models")
-    get_embedding_service().load_models()
-    get_transcription_service().load_models()
+    # With a job queue the arq worker embeds frames and transcribes; the
+    # vision warmup and Whisper are only needed for the BackgroundTasks fallback
+    get_embedding_service().load_models(warm_vision=not settings.redis_url)
+    if not settings.redis_url:
+        get_transcription_service().load_models()
     logger.info("ml_models_loaded")
 
     logger.info("application_started")
@@ -46,6 +52,9 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("application_shutting_down")
+    await get_search_cache().close()
+    await get_video_status().close()
+    await close_job_queue()
 
 
 app = FastAPI(
@@ -68,10 +77,7 @@ app.add_middleware(
 app.include_router(api_router, prefix="/api")
 
 # Mount static file directories for serving videos and frames
-# Create directories if they don't exist
-settings.upload_dir.mkdir(parents=True, exist_ok=True)
-settings.frames_dir.mkdir(parents=True, exist_ok=True)
-settings.audio_dir.mkdir(parents=True, exist_ok=True)
+# (created by get_settings() via Settings.setup_directories)
 
 # Serve uploaded videos
 app.mount("/uploads", StaticFiles(directory=str(settings.upload_dir)), name="uploads")